@@ -0,0 +1,216 @@
+"""Time the hot paths of the game on one map and print the results as JSON
+The map and the other options are given like to the game, eg.
+python benchmarks/bench_game.py -H -L -m Pac-Man -tl 24
+-H makes it run without a screen and -L turns logging off, which would
+otherwise dominate the timings. Use benchmarks/run.py to run it on every map
+and record the results"""
+import argparse
+import json
+import math
+import random
+from itertools import product
+import sys
+import os
+from timeit import repeat
+sys.path.insert(0, os.getcwd() + "/src")
+from contextlib import redirect_stdout
+with redirect_stdout(None):  # To remove the pygame hello message
+    import pygame
+
+import init as _
+from options import Options
+display = pygame.display.set_mode(Options.screen_size)  # Tile needs a screen to convert to
+from tile import Tile
+from survivor import Survivor, GridRaycaster
+from zombie import Zombie
+from bullet import Bullet
+from astar import AStar
+from maths import Vector
+from renderqueue import RenderQueue
+import python_
+try:
+    import cython_
+except ImportError:
+    cython_ = None
+
+parser = argparse.ArgumentParser("bench_game")
+parser.add_argument("--only", nargs="*", default=None,
+                    help="Only run these benchmarks, eg. astar")
+parser.add_argument("--repeat", type=int, default=5,
+                    help="How many times to repeat each benchmark, the fastest is used")
+_args, _ = parser.parse_known_args()
+
+BULLET_COUNTS = 10, 50, 200
+ZOMBIE_COUNTS = 10, 100, 500
+N_POINTS = 25, 50, 100, 200, 400
+
+
+def best(func, number, setup=None):
+    """:return the fastest time of one call to func in seconds"""
+    times = []
+    for _ in range(_args.repeat):
+        if setup is not None:
+            setup()
+        times.extend(repeat(func, number=number, repeat=1))
+    return min(times) / number
+
+
+def spawn_zombies(tiles):
+    Zombie.instances.clear()
+    Zombie.grid.clear()
+    return [Zombie(*tile.pos) for tile in tiles]
+
+
+def bench_astar(rng):
+    """A full search from 20 open tiles to the survivor, the path is thrown
+    away every time so nothing is reused. With --path_table, and with every
+    kind of PathTable, which is built before it is timed"""
+    opens = sorted(Tile.opens, key=lambda tile: tile.number)
+    survivor = Survivor(*rng.choice(opens).pos)
+    zombies = spawn_zombies(rng.sample(opens, min(20, len(opens))))
+
+    def solve_all():
+        for zombie in zombies:
+            zombie.path, zombie.path_end = [], None
+            AStar(zombie, survivor).solve()
+
+    results = {}
+    old_path_table = Options.path_table
+    for path_table in (old_path_table, "off", "next_hop", "landmarks"):
+        Options.path_table = path_table
+        AStar.load_table()
+        name = "astar.solve" if path_table == old_path_table else "astar.solve[path_table={}]".format(path_table)
+        results[name] = best(solve_all, 5) / len(zombies)
+    Options.path_table = old_path_table
+    AStar.load_table()
+    return results
+
+
+def bench_bullets(rng):
+    """Bullet.update for one frame with every combination of the amount of
+    bullets and zombies. The bullets are put back after every frame"""
+    results = {}
+    opens = sorted(Tile.opens, key=lambda tile: tile.number)
+    survivor = Survivor(*opens[0].pos)
+    directions = Bullet.new_keys
+    for n_zombies in ZOMBIE_COUNTS:
+        spawn_zombies(rng.choice(opens) for _ in range(n_zombies))
+        for n_bullets in BULLET_COUNTS:
+            bullets = []
+            for _ in range(n_bullets):
+                survivor.ammo_count = [n_bullets] * 4
+                Bullet.last_bullet = None
+                direction = Vector(*rng.choice(directions)).scale(Options.bullet_vel)
+                bullet = Bullet(Vector(*rng.choice(opens).get_centre()), direction,
+                                rng.randrange(4), survivor)
+                bullets.append((bullet, bullet.pos.copy()))
+
+            def reset():
+                Bullet.instances = {bullet for bullet, _ in bullets}
+                for bullet, pos in bullets:
+                    bullet.pos = pos.copy()
+                    bullet.hits.clear()
+                    bullet.dmg_drop = 1
+
+            name = "bullet.update[bullets={},zombies={}]".format(n_bullets, n_zombies)
+            results[name] = best(Bullet.update, 1, reset)
+    Bullet.instances.clear()
+    return results
+
+
+def bench_draw_all(rng):
+    return {"tile.draw_all": best(lambda: Tile.draw_all(display), 20)}
+
+
+def bench_night_mode(rng):
+    """Survivor.light_polygon facing every direction with a different amount of
+    rays and every engine that is available, and night_mode when the polygon is
+    cached, turning around, standing still and when the whole screen is drawn"""
+    results = {}
+    opens = sorted(Tile.opens, key=lambda tile: tile.number)
+    survivor = Survivor(*opens[len(opens) // 2].pos)
+    directions = 0, math.pi / 2, math.pi, math.pi * 3 / 2
+    lower, upper = -Survivor.human_fov / 2, Survivor.human_fov / 2
+    old_linspace, old_engine = Survivor.angle_linspace, Survivor.night_engine
+    engines = ["march"] + (["dda", "shadow"] if GridRaycaster is not None else [])
+    for engine, n_points in product(engines, N_POINTS):
+        Survivor.night_engine = engine
+        Survivor.angle_linspace = [lower + x * (upper - lower) / n_points
+                                   for x in range(n_points)]
+
+        def light_polygon():
+            for direction in directions:
+                survivor.direction = direction
+                survivor.light_polygon()
+
+        name = "survivor.light_polygon[engine={},n_points={}]".format(engine, n_points)
+        results[name] = best(light_polygon, 2) / 4
+    Survivor.angle_linspace, Survivor.night_engine = old_linspace, old_engine
+
+    canvas = display.copy()
+
+    def night_mode(turning=True):
+        for direction in directions:
+            if turning:
+                survivor.direction = direction
+            survivor.draw_torch()
+            survivor.draw(canvas)
+            survivor.night_mode(display, canvas)
+            RenderQueue.last, RenderQueue.drawn = RenderQueue.drawn, []
+
+    Survivor.light_cache.clear()
+    RenderQueue.full = False
+    night_mode()  # Fill the cache
+    results["survivor.night_mode[cached]"] = best(night_mode, 2) / 4
+    results["survivor.night_mode[still]"] = best(lambda: night_mode(False), 2) / 4
+    RenderQueue.full = True
+    results["survivor.night_mode[full]"] = best(night_mode, 2) / 4
+    RenderQueue.full = False
+    return results
+
+
+def bench_kernels(rng):
+    """The Python and the Cython version of collide and angle_between"""
+    results = {}
+    rects = [(rng.uniform(0, 100), rng.uniform(0, 100), 10, 10) for _ in range(100)]
+    points = [(rng.randrange(100), rng.randrange(100)) for _ in range(100)]
+    for name, module in (("python_", python_), ("cython_", cython_)):
+        if module is None:
+            continue
+        collide, angle_between = module.collide, module.angle_between
+
+        def collide_all():
+            for a, b in zip(rects, reversed(rects)):
+                collide(*a, *b)
+
+        def angle_all():
+            for a, b in zip(points, reversed(points)):
+                angle_between(*a, *b)
+
+        results[name + ".collide"] = best(collide_all, 100) / len(rects)
+        results[name + ".angle_between"] = best(angle_all, 100) / len(points)
+    return results
+
+
+BENCHMARKS = {"astar": bench_astar, "bullets": bench_bullets, "draw_all": bench_draw_all,
+              "night_mode": bench_night_mode, "kernels": bench_kernels}
+
+
+def main():
+    """Run the benchmarks and print {"map": .., "results": {name: seconds per call}}"""
+    Tile.create()
+    rng = random.Random(0)
+    random.seed(0)  # Zombie uses the random module for its type
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if _args.only is None or name in _args.only:
+            results.update(func(rng))
+    print(json.dumps({"map": Options.mapname[:-len(".txt")],
+                      "tiles": [Options.tiles_x, Options.tiles_y],
+                      "tile_length": Tile.length,
+                      "results": results}))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Micro-benchmark of maths.Vector against the dataclass Vector it replaced
+Run from the root of the repository with: python benchmarks/bench_vector.py"""
+import sys
+import os
+from dataclasses import dataclass
+from timeit import repeat
+sys.path.insert(0, os.getcwd() + "/src")
+from maths import Vector
+
+
+@dataclass
+class DataclassVector:
+    """The parts of the old maths.Vector that are used in the frame loop"""
+    x: float
+    y: float
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __getitem__(self, idx):
+        return (self.x, self.y)[idx]
+
+    def __add__(self, other):
+        if hasattr(other, "__getitem__"):
+            return DataclassVector(self.x + other[0], self.y + other[1])
+        else:
+            return DataclassVector(self.x + other, self.y + other)
+
+    def __iadd__(self, other):
+        if hasattr(other, "__getitem__"):
+            self.x += other[0]
+            self.y += other[1]
+        else:
+            self.x += other
+            self.y += other
+        return self
+
+    def __sub__(self, other):
+        if hasattr(other, "__getitem__"):
+            return DataclassVector(self.x - other[0], self.y - other[1])
+        else:
+            return DataclassVector(self.x - other, self.y - other)
+
+    def scale(self, scalar_or_x, y=None):
+        if y is None:
+            return DataclassVector(self.x * scalar_or_x, self.y * scalar_or_x)
+        return DataclassVector(self.x * scalar_or_x, self.y * y)
+
+    def as_ints(self):
+        return int(self.x), int(self.y)
+
+
+CASES = {
+    "pos + vel": "pos + vel",
+    "pos += vel": "p = pos; p += vel",
+    "pos - (0, 12)": "pos - (0, 12)",
+    "pos + scalar": "pos + 18",
+    "get_centre": "pos + size.scale(0.5)",
+    "as_ints": "pos.as_ints()",
+    "pos == to": "pos == to",
+    "unpack": "collide(*pos, *size)",
+}
+
+
+def bench(cls, number):
+    setup = {"pos": cls(36, 72), "vel": cls(4, 0), "to": cls(72, 72),
+             "size": cls(36, 36), "collide": lambda *args: None}
+    results = {}
+    for name, stmt in CASES.items():
+        times = repeat(stmt, globals=dict(setup), number=number, repeat=5)
+        results[name] = min(times) / number * 1e9  # nanoseconds per operation
+    return results
+
+
+def main(number=200000):
+    """Print the time of each operation for both vectors"""
+    old, new = bench(DataclassVector, number), bench(Vector, number)
+    print("{:<16}{:>12}{:>12}{:>10}".format("operation", "dataclass", "slots", "speedup"))
+    for name in CASES:
+        print("{:<16}{:>10.1f}ns{:>10.1f}ns{:>9.2f}x".format(
+            name, old[name], new[name], old[name] / new[name]))
+    return old, new
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Run bench_game.py on every map and record the results by git commit
+Run from the root of the repository with: python benchmarks/run.py
+Every map runs in its own process, as the map is read when options.py is imported.
+A* is timed on every map, the rest only on --map.
+The results are added to --output under the current commit, so two commits can
+be compared with: python benchmarks/run.py --compare <old commit>
+Works without a screen or a sound card, see --headless in options.py"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.getcwd() + "/src")
+from mapcache import list_maps
+
+parser = argparse.ArgumentParser("benchmarks")
+parser.add_argument("-m", "--map", default="Pac-Man",
+                    help="The map to run every benchmark on")
+parser.add_argument("--maps", nargs="*", default=None,
+                    help="The maps to time A* on. Defaults to every map in assets/Maps")
+parser.add_argument("-tl", "--tile_length", type=int, default=24)
+parser.add_argument("-o", "--output", default="benchmarks/results.json",
+                    help="The file to add the results to")
+parser.add_argument("-c", "--compare", default=None,
+                    help="Compare with the results of this commit in --output")
+parser.add_argument("--threshold", type=float, default=1.1,
+                    help="Mark benchmarks that are this many times slower than --compare")
+
+
+def git(*args) -> str:
+    return subprocess.run(("git",) + args, stdout=subprocess.PIPE,
+                          universal_newlines=True, check=True).stdout.strip()
+
+
+def commit_key() -> str:
+    """The short hash of HEAD, with "-dirty" if src has uncommitted changes"""
+    key = git("rev-parse", "--short", "HEAD")
+    if git("status", "--porcelain", "--", "src"):
+        key += "-dirty"
+    return key
+
+
+def run_map(name, tile_length, only=None) -> dict:
+    """Run bench_game.py on the map name in a new process"""
+    command = [sys.executable, "benchmarks/bench_game.py", "-H", "-L",
+               "-m", name, "-tl", str(tile_length)]
+    if only is not None:
+        command += ["--only"] + only
+    process = subprocess.run(command, stdout=subprocess.PIPE, universal_newlines=True)
+    if process.returncode != 0:
+        print("{} failed with exit code {}".format(name, process.returncode), file=sys.stderr)
+        return {}
+    return json.loads(process.stdout.splitlines()[-1])["results"]
+
+
+def compare(old: dict, new: dict, threshold: float):
+    """Print the time of every benchmark in both runs, slower ones are marked with !"""
+    print("{:<48}{:>12}{:>12}{:>9}".format("benchmark", "old (us)", "new (us)", "ratio"))
+    for map_name in sorted(new):
+        for name, seconds in sorted(new[map_name].items()):
+            old_seconds = old.get(map_name, {}).get(name)
+            if old_seconds is None:
+                continue
+            ratio = seconds / old_seconds
+            print("{:<48}{:>12.2f}{:>12.2f}{:>8.2f}x{}".format(
+                map_name + ": " + name, old_seconds * 1e6, seconds * 1e6, ratio,
+                " !" if ratio > threshold else ""))
+
+
+def main():
+    args = parser.parse_args()
+    maps = args.maps
+    if maps is None:
+        maps = [name[:-len(".txt")] for name in list_maps()]
+    results = {}
+    for name in maps:
+        print("timing", name, file=sys.stderr)
+        results[name] = run_map(name, args.tile_length, only=["astar"])
+    results.setdefault(args.map, {}).update(run_map(args.map, args.tile_length))
+
+    recorded = {}
+    if os.path.isfile(args.output):
+        with open(args.output) as file:
+            recorded = json.load(file)
+    old = recorded.get(args.compare)
+    key = commit_key()
+    recorded[key] = {"date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                     "python": platform.python_version(),
+                     "machine": platform.machine(),
+                     "tile_length": args.tile_length,
+                     "results": results}
+    with open(args.output, "w") as file:
+        json.dump(recorded, file, indent=2, sort_keys=True)
+    print("saved as", key, "in", args.output, file=sys.stderr)
+
+    if args.compare is not None:
+        if old is None:
+            sys.exit("{} is not in {}".format(args.compare, args.output))
+        compare(old["results"], results, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Load the images and sounds the first time they are used, and keep them"""
+
+import logging
+import threading
+from glob import glob
+from time import perf_counter
+
+import pygame
+
+import init as _
+from options import Options
+
+
+class Assets:
+    """Every image and sound is read from disk once. An image is kept both as it
+    is in the file and scaled to every size it has been asked for, so asking
+    for an image again costs a dict lookup.
+    Assets.preload reads the files the game needs in a thread, while the intro
+    screen is shown, so they don't have to be read when the game starts.
+    Asking for a file which is being preloaded waits for it
+    Example:
+    >>> image = Assets.image("assets/Images/PickUps/ammo.png", (10, 20))
+    >>> image.get_size()
+    (10, 20)
+    >>> Assets.image("assets/Images/PickUps/ammo.png", (10, 20)) is image
+    True"""
+    images = {}  # (path, size) -> Surface, size is None for the image as it is in the file
+    sounds = {}  # path -> Sound
+    lock = threading.RLock()  # Held while a file is read, so it isn't read twice
+    preload_patterns = ("assets/Images/Zombies/zombie?.png",
+                        "assets/Images/Players/player_{}_?.png".format(Options.gender),
+                        "assets/Images/Weapons/*.png",
+                        "assets/Images/Bullets/*.png",
+                        "assets/Images/Drops/*.png",
+                        "assets/Images/PickUps/*.png",
+                        "assets/Images/Other/*",
+                        "assets/Audio/Gunshots/*.wav",
+                        "assets/Audio/Spawn/*.wav",
+                        "assets/Audio/Drop/*.ogg",
+                        "assets/Audio/PickUp/*.ogg",
+                        "assets/Audio/Other/*.ogg")
+    preloader = None  # The thread started by preload
+
+    @classmethod
+    def image(cls, path: str, size=None) -> pygame.Surface:
+        """Return the image in path scaled to size, a Vector or a tuple.
+        The image isn't scaled if size is None. Don't draw on the returned
+        surface, it is the same surface every time"""
+        if size is not None:
+            size = tuple(int(i) for i in size)
+        key = path, size
+        try:
+            return cls.images[key]
+        except KeyError:
+            pass
+        with cls.lock:
+            if key not in cls.images:
+                if size is None:
+                    cls.images[key] = pygame.image.load(path)
+                else:
+                    cls.images[key] = pygame.transform.scale(cls.image(path), size)
+            return cls.images[key]
+
+    @classmethod
+    def sound(cls, path: str) -> pygame.mixer.Sound:
+        """Return the sound in path. It is the same Sound every time,
+        so its volume is the volume it was last set to"""
+        try:
+            return cls.sounds[path]
+        except KeyError:
+            pass
+        with cls.lock:
+            if path not in cls.sounds:
+                cls.sounds[path] = pygame.mixer.Sound(path)
+            return cls.sounds[path]
+
+    @classmethod
+    def preload(cls):
+        """Start reading every file in preload_patterns in a thread, if it hasn't been started"""
+        if cls.preloader is None:
+            cls.preloader = threading.Thread(target=cls._preload, name="preload", daemon=True)
+            cls.preloader.start()
+
+    @classmethod
+    def _preload(cls):
+        start = perf_counter()
+        paths = [path.replace("\\", "/") for pattern in cls.preload_patterns
+                 for path in sorted(glob(pattern))]
+        for path in paths:
+            if path.endswith((".wav", ".ogg")):
+                cls.sound(path)
+            else:
+                cls.image(path)
+        logging.info("preloaded %s files in %.3f s", len(paths), perf_counter() - start)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
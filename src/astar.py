@@ -1,72 +1,162 @@
 import heapq
+from array import array
 
 from options import Options
 from tile import Tile
 from drop import Drop
+from pathtable import PathTable
+from profiler import Profiler
+
+
+class SearchSpace:
+    """The state of an A* search kept in flat arrays indexed by Tile.number
+    instead of as attributes on the tiles.
+    Every search gets a new generation number. An entry in g and parent is only
+    valid if seen has the current generation, and a tile is closed if closed has
+    the current generation. This way nothing has to be reset between searches,
+    and a search only touches the tiles it explores.
+    Params:
+    size: The amount of tiles, usually Tile.amnt_tiles"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.g = array("l", [0]) * size
+        self.parent = array("l", [-1]) * size
+        self.seen = array("l", [0]) * size
+        self.closed = array("l", [0]) * size
+        self.generation = 0
+
+    def search(self, start: int, end: int, neighbours, heuristic) -> list:
+        """Find the shortest path from start to end
+        :param start: number of the start tile
+        :param end: number of the end tile
+        :param neighbours: a function returning the numbers of the walkable neighbours of a tile number
+        :param heuristic: a function returning the estimated amount of steps from a tile number to end
+        :return a list of the tile numbers on the path, from end to the tile after start.
+        Empty if end is start or if end can't be reached"""
+        self.generation += 1
+        gen = self.generation
+        g, parent, seen, closed = self.g, self.parent, self.seen, self.closed
+        g[start], parent[start], seen[start] = 0, -1, gen
+        open_ = [(heuristic(start), start)]
+        expanded = 0
+        while open_:
+            _, num = heapq.heappop(open_)
+            if closed[num] == gen:  # An outdated entry, the tile was pushed again with a lower cost
+                continue
+            if num == end:
+                break
+            closed[num] = gen
+            expanded += 1
+            new_g = g[num] + 1
+            for neighbour in neighbours(num):
+                if closed[neighbour] == gen:
+                    continue
+                if seen[neighbour] != gen or new_g < g[neighbour]:
+                    seen[neighbour] = gen
+                    g[neighbour] = new_g
+                    parent[neighbour] = num
+                    heapq.heappush(open_, (new_g + heuristic(neighbour), neighbour))
+        else:  # No break, end can't be reached
+            Profiler.count("astar expansions", expanded)
+            return []
+        Profiler.count("astar expansions", expanded)
+
+        path = []
+        num = end
+        while num != start:
+            path.append(num)
+            num = parent[num]
+        return path
 
 
 class AStar:
-    NSEW = -Options.tiles_x, Options.tiles_x, 1, -1  # Add to find tile in a direction
+    """Find the path from zombie to survivor and set the zombie's target to the next tile
+    The path is kept in zombie.path together with the tile it leads to in zombie.path_end.
+    If the survivor is still on that tile the path is reused, and if the survivor has
+    moved one tile only the end of the path is repaired. After max_repairs repairs in
+    a row the path is searched for from scratch again, as every repair may make it
+    up to two tiles longer than the shortest path.
+    With a PathTable, see --path_table and AStar.load_table, a path is looked up instead
+    of searched for, or searched for with the landmark bounds of the table as the heuristic"""
+    space = None  # A SearchSpace shared by all searches
+    table = None  # The PathTable of the map, None until AStar.load_table and with --path_table off
+    planner = None  # planner.Planner while it is running, see --planner
+    max_repairs = 4
 
     def __init__(self, zombie, survivor):
-        for tile in Tile.opens:  # Reset from last search
-            tile.parent = None
-            tile.h, tile.f, tile.g = 0, 0, 0
-        zombie.path = []
-        self.open = []
-        heapq.heapify(self.open)
-        self.closed = set()
+        if AStar.space is None or AStar.space.size != Tile.amnt_tiles:
+            AStar.space = SearchSpace(Tile.amnt_tiles)
         self.zombie = zombie
         self.start = zombie.get_tile()
         self.end = survivor.get_tile()
         if "trans" in Drop.actives:
             self.end = self.end.closest_open_tile()
-            if self.end is self.start:
-                self.solve = lambda *_: None  # overwrite solve and make the zombie stay
-        heapq.heappush(self.open, (self.start.f, self.start))
+        self.end_y, self.end_x = divmod(self.end.number, Options.tiles_x)
+        table = AStar.table
+        self.bound = None
+        if table is not None and table.landmarks:
+            self.bound = table.bound(self.start.number, self.end.number)
 
-    def get_neighbours(self, cell):
-        for cardinal, offset in enumerate(AStar.NSEW):
-            sur_tile_num = cell.number + offset
-            try:
-                sur_tile = Tile.instances[sur_tile_num]
-            except IndexError:
-                continue
-            if (sur_tile.walkable and sur_tile not in self.closed and
-                    Tile.on_screen(cardinal, sur_tile_num)):
-                yield sur_tile
+    @classmethod
+    def load_table(cls):
+        """Set AStar.table to the PathTable of the map with --path_table. Called before the
+        game starts, as building a table the first time can take seconds on a large map"""
+        if Options.path_table == "off":
+            cls.table = None
+        else:
+            cls.table = PathTable.of(Options.compiled_map, Options.path_table)
 
-    def get_heuristic(self, cell):
-        """:return the Manhattan distance between end and cell
-        https://en.wikipedia.org/wiki/Taxicab_geometry"""
-        return 10 * (self.end.pos - cell.pos).manhattan_dist() / Tile.length
+    def get_heuristic(self, num: int):
+        """:return the Manhattan distance in tiles between end and the tile with number num
+        https://en.wikipedia.org/wiki/Taxicab_geometry
+        or the landmark bound of the PathTable if it is larger"""
+        y, x = divmod(num, Options.tiles_x)
+        manhattan = abs(self.end_x - x) + abs(self.end_y - y)
+        if self.bound is None:
+            return manhattan
+        return max(manhattan, self.bound(num))
 
-    def update_cell(self, neighbour, cell):
-        neighbour.g = cell.g + 10
-        neighbour.h = self.get_heuristic(neighbour)
-        neighbour.f = neighbour.h + neighbour.g
-        neighbour.parent = cell
+    def repair(self) -> bool:
+        """Try to reuse zombie.path for the new end
+        :return True if zombie.path leads to end, False if it must be searched for"""
+        zombie, path = self.zombie, self.zombie.path
+        if not path or zombie.path_end is None:
+            return False
+        if self.end is zombie.path_end:  # The survivor hasn't moved
+            return True
+        if (zombie.repairs >= AStar.max_repairs or
+                self.end.number not in Tile.neighbours(zombie.path_end.number)):
+            return False
+        if self.end is self.start:
+            path.clear()
+        elif self.end in path:  # The survivor moved towards the zombie, cut the path short
+            del path[:path.index(self.end)]
+        else:  # The survivor moved away, add a step to the path
+            path.insert(0, self.end)
+        zombie.path_end = self.end
+        zombie.repairs += 1
+        return True
 
     def solve(self):
-        while self.open and self.end not in self.closed:
-            f, cell = heapq.heappop(self.open)
-            assert cell.walkable
-            self.closed.add(cell)
-            neighbours = self.get_neighbours(cell)
-            for neighbour in neighbours:
-                if (neighbour.f, neighbour) in self.open:
-                    if neighbour.g > cell.g + 10:
-                        self.update_cell(neighbour, cell)
-                else:
-                    self.update_cell(neighbour, cell)
-                    heapq.heappush(self.open, (neighbour.f, neighbour))
-
-        parent = self.end
-        while not (parent is None or parent is self.start):
-            child = parent
-            parent = parent.parent
-            self.zombie.path.append(child)
-        self.zombie.set_target(child)
+        zombie = self.zombie
+        if zombie.path and zombie.path[-1] is self.start:
+            zombie.path.pop()  # The zombie has arrived at the next tile on the path
+        if not self.repair():
+            if AStar.planner is not None:  # Follow the old path until the planner has found the new one
+                AStar.planner.request(zombie, self.start, self.end)
+                if zombie.path:
+                    zombie.set_target(zombie.path[-1])
+                return
+            path = None if AStar.table is None else AStar.table.path(self.start.number, self.end.number)
+            if path is None:  # No next hops, search for it
+                path = AStar.space.search(self.start.number, self.end.number,
+                                          Tile.neighbours, self.get_heuristic)
+            zombie.path = [Tile.instances[num] for num in path]
+            zombie.path_end = self.end
+            zombie.repairs = 0
+        if zombie.path:  # Else the zombie is on end and stays
+            zombie.set_target(zombie.path[-1])
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 """Includes the Baseclass for Zombie, Survivor, Bullet, PickUp, and Drop"""
 
+from itertools import count
+
 import init as _
 from options import Options
 from maths import Vector
@@ -13,6 +15,8 @@ class BaseClass:
     y: The y coordinate
     width: (Optional) Used by the Bullet Class as it has another size. Defaults to Tile.length
     height: (Optional) Used by the Bullet Class as it has another size. Defaults to Tile.length"""
+    serials = count()  # The instances are hashed by the order they were made in, see __hash__
+    interpolation = 1.  # How far from last_pos to pos everything is drawn, see draw_pos
 
     def __init__(self, x, y, width=None, height=None):
         if width is None and height is None:
@@ -22,14 +26,42 @@ class BaseClass:
         self._size = Vector(self.width, self.height)
         self.to = None
         self.pos = Vector(x, y)
+        self.last_pos = self.pos.copy()
+        self.serial = next(BaseClass.serials)
+
+    def __hash__(self):
+        """The instances are kept in sets, which are iterated in the order of the
+        hashes. The default hash is the memory address, which changes between games,
+        so the zombies would be updated in a different order when a game is replayed"""
+        return self.serial
+
+    def draw_pos(self):
+        """Return where to draw self, interpolation of the way from where self was the
+        last simulated frame to where it is now, so it moves smoothly when the game is
+        drawn more often than it is simulated, see main.main_loop
+        >>> a = BaseClass(x=0, y=0)
+        >>> a.pos += (10, 4)
+        >>> BaseClass.interpolation = 0.5
+        >>> a.draw_pos()
+        (5, 2)
+        >>> BaseClass.interpolation = 1."""
+        last, pos, t = self.last_pos, self.pos, BaseClass.interpolation
+        return int(last.x + (pos.x - last.x) * t), int(last.y + (pos.y - last.y) * t)
+
+    @staticmethod
+    def remember_positions(*groups):
+        """Set last_pos to pos for everything in groups, before they are moved"""
+        for group in groups:
+            for instance in group:
+                instance.last_pos = instance.pos.copy()
 
     def get_centre(self) -> Vector:
-        return self.pos + self._size.scale(0.5)
+        return Vector(self.pos.x + self.width * 0.5, self.pos.y + self.height * 0.5)
 
     centre = property(get_centre, doc="""Return a vector of the pos in the middle of self
                                          >>> a = BaseClass(x=0, y=0, width=10, height=10)
                                          >>> a.centre
-                                         Vector(x=5, y=5)""")
+                                         Vector(x=5.0, y=5.0)""")
 
     def get_number(self) -> int:
         """Return the index of tile that self is on"""
@@ -48,12 +80,3 @@ class BaseClass:
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
-    from timeit import timeit
-    setup = """
-from __main__ import BaseClass, Tile
-Tile.create()
-a = BaseClass(45, 91)
-b = BaseClass(45, 90)
-Options = Tile.instances[34]
-"""
-    print(timeit("a.collide(b)", setup=setup))
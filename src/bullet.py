@@ -3,11 +3,8 @@
 import logging
 import math
 
-import pygame
-
 import init as _
 from maths import Vector
-from options import Options
 from baseclass import BaseClass
 from drop import Drop
 from survivor import Survivor
@@ -16,8 +13,12 @@ try:
 except ImportError:
     from python_ import collide
 from zombie import Zombie
-from miscellaneous import stats, scale, new_dir_func
+from miscellaneous import stats, new_dir_func, SpriteAtlas
+from assets import Assets
+from soundbank import SoundBank
 from tile import Tile
+from profiler import Profiler
+from renderqueue import RenderQueue
 
 
 class Bullet(BaseClass):
@@ -30,20 +31,17 @@ class Bullet(BaseClass):
     width, height = 7, 9
     instances = set()
     images = (
-        scale(pygame.image.load('assets/Images/Bullets/pistol_b.png'), Tile.size.scale(1/3, 1/5)),
-        scale(pygame.image.load('assets/Images/Bullets/shotgun_b2.png'), Tile.size.scale(1/3, 1/5)),
-        scale(pygame.image.load('assets/Images/Bullets/automatic_b.png'), Tile.size.scale(1/3, 1/5)),
-        scale(pygame.image.load('assets/Images/Bullets/sniper_b2.png'), Tile.size.scale(1/3, 1/5))
+        Assets.image('assets/Images/Bullets/pistol_b.png', Tile.size.scale(1/3, 1/5)),
+        Assets.image('assets/Images/Bullets/shotgun_b2.png', Tile.size.scale(1/3, 1/5)),
+        Assets.image('assets/Images/Bullets/automatic_b.png', Tile.size.scale(1/3, 1/5)),
+        Assets.image('assets/Images/Bullets/sniper_b2.png', Tile.size.scale(1/3, 1/5))
     )
+    SpriteAtlas.add("bullet", images)
 
-    sounds = (
-        pygame.mixer.Sound('assets/Audio/Gunshots/pistol.wav'),
-        pygame.mixer.Sound('assets/Audio/Gunshots/shotgun2.wav'),
-        pygame.mixer.Sound('assets/Audio/Gunshots/automatic.wav'),
-        pygame.mixer.Sound('assets/Audio/Gunshots/sniper.wav')
-    )
-    for sound in sounds:
-        sound.set_volume(Options.volume / 2)
+    SoundBank.add("gunshots", ('assets/Audio/Gunshots/pistol.wav',
+                               'assets/Audio/Gunshots/shotgun2.wav',
+                               'assets/Audio/Gunshots/automatic.wav',
+                               'assets/Audio/Gunshots/sniper.wav'), channels=6, volume=0.5)
 
     dmg_func = (lambda d: max((-0.00442 * d ** 2 - 1.4273 * d + 1433.3) / Tile.length, 12),
                 lambda d: ((432000 * math.e ** ((-1) / 20 * d) + 720) /
@@ -56,8 +54,8 @@ class Bullet(BaseClass):
     last_bullet = None
 
     new_keys = (0, -1), (0, 1), (-1, 0), (1, 0)
-    vel2img = dict(zip(new_keys, new_dir_func.values()))
-    # Exchange the keys of new_dir_func with new_keys
+    vel2dir = dict(zip(new_keys, new_dir_func))
+    # The direction in radians of a velocity with only one component
 
     def __init__(self, pos: Vector, vel: Vector, type_: int, survivor: Survivor):
         if survivor.ammo_count[type_] <= 0:
@@ -69,18 +67,18 @@ class Bullet(BaseClass):
         except TypeError:  # If Bullet.last_bullet hasn't been updated yet. 1st bullet
             dist = None
 
-        Bullet.sounds[type_].play()
+        SoundBank.play("gunshots", type_)
         survivor.ammo_count[type_] -= 1
         self.type = type_
         self.orgpos = pos
         self.vel = vel
         self.dmg_drop = 1
         self.hits = set()
-        Bullet.instances.add(self)
         stats['Bullets Fired'] += 1
         self.vel_as_signs = vel.signs()  # Eg. (-3, 0) -> (-1, 0)
-        self.img = Bullet.vel2img[self.vel_as_signs](Bullet.images[type_])
+        self.img = SpriteAtlas.sprites[("bullet", type_), Bullet.vel2dir[self.vel_as_signs]]
         super().__init__(*pos, Bullet.width, Bullet.height)
+        Bullet.instances.add(self)  # After BaseClass.__init__, which gives it its hash
         Bullet.last_bullet = [pos, pos.copy(), vel]
         logging.info('pos: %s, vel: %s, type: %s, dist: %s, last_bullet: %s, sign: %s' +
                       'survivor pos: %s',
@@ -100,21 +98,24 @@ class Bullet(BaseClass):
         return (in_wall and not_trans) or off_screen
 
     @classmethod
-    def update(cls, screen):
+    def update(cls):
         if cls.last_bullet is not None:
             # If no bullets has been fired last_bullet is None
             cls.last_bullet[1] += cls.last_bullet[2]
         del_bullets = set()
+        tests = 0
 
         for bullet in cls.instances:
-            bullet.pos += bullet.vel
-            screen.blit(bullet.img, bullet.pos.as_ints())
+            bullet.pos.add_ip(bullet.vel.x, bullet.vel.y)
 
             if bullet.is_hitting_wall():
                 del_bullets.add(bullet)
                 del bullet
                 continue
-            for zombie in Zombie.instances - bullet.hits:
+            for zombie in Zombie.grid.query(bullet):
+                if zombie in bullet.hits:
+                    continue
+                tests += 1
                 if collide(*bullet.pos, *bullet._size, *zombie.pos, *zombie._size):
                     dmg = bullet.calc_dmg()
                     assert dmg > 0
@@ -128,3 +129,9 @@ class Bullet(BaseClass):
                     bullet.hits.add(zombie)
 
         cls.instances -= del_bullets
+        Profiler.count("collision tests", tests)
+
+    @classmethod
+    def draw_all(cls, screen):
+        for bullet in cls.instances:
+            RenderQueue.blit(screen, bullet.img, bullet.draw_pos())
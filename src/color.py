@@ -1,4 +1,3 @@
-from random import random,  uniform
 from math import inf
 
 from pygame import Color as PyGameColor
@@ -6,6 +5,8 @@ from colormath.color_objects import sRGBColor, LabColor, HSVColor
 from colormath.color_conversions import convert_color
 from colormath.color_diff import delta_e_cie2000
 
+from rng import rng
+
 
 class Color(sRGBColor):
     def __init__(self, r, g=None, b=None, is_upscaled=False, upscale=False):
@@ -51,7 +52,7 @@ class Color(sRGBColor):
         tolerance = 70
         lab_colours = [convert_color(color.norm(), LabColor) for color in colors]
         while True:
-            new_hsv = HSVColor(uniform(0, 360), random(), random())
+            new_hsv = HSVColor(rng.uniform(0, 360), rng.random(), rng.random())
             new_lab = convert_color(new_hsv, LabColor)
             min_d = inf
             for color in lab_colours:
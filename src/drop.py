@@ -1,7 +1,3 @@
-import random
-
-import pygame
-
 import init as _
 from baseclass import BaseClass
 from options import Options
@@ -10,7 +6,12 @@ try:
     from cython_ import collide
 except ImportError:
     from python_ import collide
-from miscellaneous import scale
+from assets import Assets
+from tile import Tile
+from spatialhash import SpatialHash
+from profiler import Profiler
+from renderqueue import RenderQueue
+from rng import rng
 
 
 def full_ammo(survivor, *_):
@@ -57,12 +58,13 @@ class Drop(BaseClass):
     TODO: Add more types of power ups"""
 
     instances = set()
+    grid = SpatialHash()
 
-    load_img = lambda s: scale(pygame.image.load("assets/Images/Drops/%s.png" % s))
+    load_img = lambda s: Assets.image("assets/Images/Drops/%s.png" % s, Tile.size)
     imgs = (load_img("max_ammo"), load_img("quad_damage"),
             load_img("freeze"), load_img("through_walls"))
 
-    load_sound = lambda s: pygame.mixer.Sound("assets/Audio/Drop/%s.ogg" % s)
+    load_sound = lambda s: Assets.sound("assets/Audio/Drop/%s.ogg" % s)
     sounds = (load_sound("max_ammo"),load_sound("quad_damage"),
               load_sound("freeze"),load_sound("through_walls"))
     for sound in sounds:
@@ -75,30 +77,34 @@ class Drop(BaseClass):
     def __init__(self, pos: Vector, type_: int):
         self.type_ = type_
         self.countdown = Options.fps * 5
-        Drop.instances.add(self)
         super().__init__(*pos)
+        Drop.instances.add(self)
+        Drop.grid.insert(self)
 
     @classmethod
     def spawn(cls, pos: Vector):
-        if random.random() < cls.probability:
+        if rng.random() < cls.probability:
             return
-        type_ = random.randint(0, len(cls.effects) - 1)
+        type_ = rng.randint(0, len(cls.effects) - 1)
         cls(pos, type_)
 
     @classmethod
-    def update(cls, screen, survivor):
+    def update(cls, survivor):
         del_drops = set()
         for drop in cls.instances:
             drop.countdown -= 1
             if drop.countdown == 0:
                 del_drops.add(drop)
-                continue
-            screen.blit(cls.imgs[drop.type_], drop.pos.as_ints())
-            if collide(*drop.pos, *drop._size, *survivor.pos, *survivor._size):
+        candidates = cls.grid.query(survivor)
+        Profiler.count("collision tests", len(candidates))
+        for drop in candidates:
+            if drop not in del_drops and collide(*drop.pos, *drop._size,
+                                                 *survivor.pos, *survivor._size):
                 cls.effects[drop.type_](survivor)
                 cls.sounds[drop.type_].play()
                 del_drops.add(drop)
-                continue
+        for drop in del_drops:
+            cls.grid.remove(drop)
         cls.instances -= del_drops
         for power_up, value in tuple(cls.actives.items()):
             cls.actives[power_up] -= 1
@@ -108,3 +114,8 @@ class Drop(BaseClass):
                     survivor.pos = new_tile.pos.copy()
                     survivor.to = None
                 del cls.actives[power_up]
+
+    @classmethod
+    def draw_all(cls, screen):
+        for drop in cls.instances:
+            RenderQueue.blit(screen, cls.imgs[drop.type_], drop.pos.as_ints())
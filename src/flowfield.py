@@ -0,0 +1,64 @@
+"""A flow field shared by all zombies, an alternative to one AStar per zombie"""
+
+from collections import deque
+
+from tile import Tile
+from drop import Drop
+
+
+class FlowField:
+    """A breadth first search from the survivor's tile to every walkable tile.
+    The search is only run when the survivor changes tile. For every tile it
+    stores the number of the neighbour one step closer to the survivor, so a
+    zombie finds its next tile with a single lookup regardless of how many
+    zombies there are.
+
+    Example with the survivor on S, each tile points to the next tile:
+    #####
+    #→→S#
+    #↑#↑#
+    #↑←↑#
+    #####"""
+    target = None  # The tile the field was computed towards
+    next_num = []  # next_num[n] is the number of the next tile from tile n, -1 if unreachable
+
+    @classmethod
+    def update(cls, survivor):
+        """Recompute the field if the survivor is on a new tile"""
+        target = survivor.get_tile()
+        if "trans" in Drop.actives:
+            target = target.closest_open_tile()
+        if target is cls.target:
+            return
+        cls.target = target
+        next_num = [-1] * Tile.amnt_tiles
+        next_num[target.number] = target.number
+        queue = deque((target.number,))
+        adjacency, adjacency_start = Tile.adjacency, Tile.adjacency_start
+        while queue:
+            num = queue.popleft()
+            for i in range(adjacency_start[num], adjacency_start[num + 1]):
+                sur_num = adjacency[i]
+                if next_num[sur_num] == -1:
+                    next_num[sur_num] = num
+                    queue.append(sur_num)
+        cls.next_num = next_num
+
+    @classmethod
+    def step(cls, zombie) -> bool:
+        """Set the target of zombie to the next tile towards the survivor
+        :return False if the zombie's tile is not in the field, True otherwise"""
+        num = zombie.get_number()
+        next_num = cls.next_num[num]
+        if next_num == -1:
+            return False
+        if next_num != num:  # The zombie stays if it is on the survivor's tile
+            next_tile = Tile.instances[next_num]
+            zombie.path, zombie.path_end = [next_tile], None
+            zombie.set_target(next_tile)
+        return True
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
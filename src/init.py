@@ -9,6 +9,9 @@ sys.path.append("/src/")
 
 from options import Options
 
+if Options.headless:  # Let SDL run without a screen or sound card
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 
 pygame.mixer.pre_init(44100, -16, 1, 512)  # Makes all gun sounds play
 # Without this, only some play because they are so close together
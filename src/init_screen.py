@@ -9,6 +9,7 @@ from options import Options
 from color import WHITE
 
 import settings
+from assets import Assets
 
 data = json.load(open("src/screen_text.json"))
 
@@ -22,12 +23,12 @@ def middle_of_screen(text):
 
 
 def main():
+    Assets.preload()  # While the intro is shown, or while the rest of the game is imported
     if Options.skip_intro:
         return
     screen = pygame.display.set_mode(Options.screen_size)
     clock = pygame.time.Clock()
-    intro_img = pygame.image.load("assets/Images/Other/intro.jpg")
-    scaled_intro_img = pygame.transform.scale(intro_img, (Options.width, Options.height))
+    scaled_intro_img = Assets.image("assets/Images/Other/intro.jpg", (Options.width, Options.height))
     move_text = get_text("move")
     shoot_text = get_text("shoot")
     weapon_text = get_text("weapon")
@@ -0,0 +1,189 @@
+"""Sources of the keys the survivor is controlled with each frame"""
+
+import logging
+import warnings
+
+import pygame
+
+import init as _
+from options import Options, REPLAY_MAGIC, REPLAY_VERSION, REPLAY_HEADER, REPLAY_FRAME
+from interaction import other, switch_gun
+
+KEYS = {"w": pygame.K_w, "a": pygame.K_a, "s": pygame.K_s, "d": pygame.K_d,
+        "left": pygame.K_LEFT, "right": pygame.K_RIGHT,
+        "up": pygame.K_UP, "down": pygame.K_DOWN, "e": pygame.K_e}
+# The keys that can be used in a script, by their name
+
+SWITCH_GUN = 1 << 15  # Set in a frame if the gun was switched
+
+DEFAULT_SCRIPT = """\
+# Walk around in a square, and shoot in every direction with every gun
+20 d right
+20 s down
+20 a left
+20 w up
+1 e
+20 left up
+20 right down
+1 e
+40 d
+40 a
+"""
+
+
+class KeyState:
+    """The pressed keys as a sequence indexed by key, like pygame.key.get_pressed()
+    >>> keys = KeyState({pygame.K_w})
+    >>> keys[pygame.K_w], keys[pygame.K_a]
+    (True, False)"""
+
+    def __init__(self, pressed):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    @classmethod
+    def from_mask(cls, mask: int):
+        """The keys in a frame of a replay, see Recorder
+        >>> KeyState.from_mask(0b11).pressed == {pygame.K_w, pygame.K_a}
+        True"""
+        return cls(key for i, key in enumerate(KEYS.values()) if mask >> i & 1)
+
+    @staticmethod
+    def to_mask(keys) -> int:
+        """Turn the pressed keys in KEYS into a frame of a replay
+        :param keys: The pressed keys like pygame.key.get_pressed()
+        >>> KeyState.to_mask(KeyState({pygame.K_a, pygame.K_e}))
+        258"""
+        return sum(1 << i for i, key in enumerate(KEYS.values()) if keys[key])
+
+
+class LiveInput:
+    """Handle pygame's events and read the keyboard"""
+
+    def poll(self, screen, survivor):
+        other(screen, survivor)
+        return pygame.key.get_pressed()
+
+
+class ScriptedInput:
+    """Press keys from a script instead of the keyboard, used by --headless
+    Every line of the script is how many frames to hold some keys, followed by
+    the names of the keys in KEYS. Lines starting with # are ignored.
+    The script starts from the top when it is finished.
+    "e" changes gun once when it is pressed, like the real key.
+    Params:
+    script: The script as a string
+    Example:
+    >>> source = ScriptedInput("2 d right\\n1 e")
+    >>> [sorted(keys.pressed) == sorted((pygame.K_d, pygame.K_RIGHT)) for keys in source.steps[:2]]
+    [True, True]"""
+
+    def __init__(self, script: str = DEFAULT_SCRIPT):
+        self.steps = []
+        for line in script.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            frames, *names = line.split()
+            keys = KeyState(KEYS[name.lower()] for name in names)
+            self.steps.extend([keys] * int(frames))
+        assert self.steps, "The script has no frames"
+        self.frame = 0
+        self.last = KeyState(())
+
+    @classmethod
+    def from_file(cls, path):
+        """Read the script from path, or use DEFAULT_SCRIPT if path is None"""
+        if path is None:
+            return cls()
+        with open(path) as file:
+            logging.info("script: %s", path)
+            return cls(file.read())
+
+    def poll(self, screen, survivor):
+        keys = self.steps[self.frame % len(self.steps)]
+        if keys[pygame.K_e] and not self.last[pygame.K_e]:
+            switch_gun(survivor)
+        self.last = keys
+        self.frame += 1
+        return keys
+
+
+class Recorder:
+    """Pass on the keys from another source, and write them to a file which
+    ReplayInput can play again, used by --record. The file starts with
+    REPLAY_HEADER and the name of the map, followed by one REPLAY_FRAME per frame.
+    Switching gun is recorded when it happens instead of the "e" key,
+    since the gun is switched by an event and not by reading the keyboard
+    Params:
+    source: Where the keys come from, e.g. LiveInput
+    path: The file to write to"""
+
+    def __init__(self, source, path: str):
+        self.source = source
+        self.file = open(path, "wb")
+        mapname = Options.mapname.encode()
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, Options.seed,
+                                           Options.tile_length, Options.fps, len(mapname)))
+        self.file.write(mapname)
+        logging.info("recording to %s", path)
+
+    def poll(self, screen, survivor):
+        gun = survivor.current_gun
+        keys = self.source.poll(screen, survivor)
+        mask = KeyState.to_mask(keys)
+        if survivor.current_gun != gun:
+            mask |= SWITCH_GUN
+        self.file.write(REPLAY_FRAME.pack(mask))
+        return keys
+
+    def close(self):
+        self.file.close()
+
+
+class ReplayInput:
+    """Press the keys recorded by Recorder, used by --replay.
+    The game is seeded with self.seed by Options, before anything draws from rng,
+    so it is the same game
+    Params:
+    data: The content of a file written by Recorder
+    handle_events: If True, the events are handled like when playing,
+    but the keys that change the game are ignored, see interaction.other"""
+
+    def __init__(self, data: bytes, handle_events: bool = False):
+        magic, version, self.seed, self.tile_length, self.fps, length = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("Not a replay made by --record")
+        start = REPLAY_HEADER.size + length
+        self.mapname = data[REPLAY_HEADER.size:start].decode()
+        self.masks = [mask for mask, in REPLAY_FRAME.iter_unpack(data[start:])]
+        self.handle_events = handle_events
+        self.frame = 0
+
+    @classmethod
+    def from_file(cls, path: str):
+        """Read the replay from path, and warn if it was recorded with other options"""
+        with open(path, "rb") as file:
+            replay = cls(file.read(), handle_events=not Options.headless)
+        recorded = replay.mapname, replay.tile_length, replay.fps
+        if recorded != (Options.mapname, Options.tile_length, Options.fps):
+            warnings.warn("{} was recorded with the map, tile length and fps {}, "
+                          "not {}".format(path, recorded, (Options.mapname, Options.tile_length, Options.fps)))
+        logging.info("replay: %s, seed: %s, frames: %s", path, replay.seed, len(replay.masks))
+        return replay
+
+    def poll(self, screen, survivor):
+        if self.handle_events:
+            other(screen, survivor, replaying=True)
+        mask = self.masks[self.frame]
+        if mask & SWITCH_GUN:
+            switch_gun(survivor)
+        self.frame += 1
+        return KeyState.from_mask(mask)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -15,6 +15,16 @@ from maths import Vector
 from miscellaneous import pause, game_over
 from tile import Tile
 from drop import full_ammo, Drop
+from profiler import Profiler
+from renderqueue import RenderQueue
+
+
+def can_walk(from_num: int, to_num: int, cardinal: int):
+    """Return True if the survivor can walk from the tile from_num to the next tile to_num
+    cardinal is the index of the direction in Tile.NSEW"""
+    if "trans" in Drop.actives:
+        return Tile.on_screen(cardinal, to_num)
+    return to_num in Tile.neighbours(from_num)
 
 
 def walking(survivor, keys: List[int]):
@@ -22,61 +32,63 @@ def walking(survivor, keys: List[int]):
         return
     if keys[pygame.K_w]:  # North
         future_tile_num = survivor.get_number() - Options.tiles_x
-        if Tile.on_screen(0, future_tile_num):
-            future_tile = Tile.instances[future_tile_num]
-            if future_tile.walkable or "trans" in Drop.actives:
-                survivor.set_target(future_tile)
-                survivor.rotate(pi / 2)
-                survivor.vel = Vector(0, -Options.speed)
+        if can_walk(survivor.get_number(), future_tile_num, 0):
+            survivor.set_target(Tile.instances[future_tile_num])
+            survivor.rotate(pi / 2)
+            survivor.vel = Vector(0, -Options.speed)
 
     if keys[pygame.K_s]:  # South
         future_tile_num = survivor.get_number() + Options.tiles_x
-        if Tile.on_screen(1, future_tile_num):
-            future_tile = Tile.instances[future_tile_num]
-            if future_tile.walkable or "trans" in Drop.actives:
-                survivor.set_target(future_tile)
-                survivor.rotate(pi * 3 / 2)
-                survivor.vel = Vector(0, Options.speed)
+        if can_walk(survivor.get_number(), future_tile_num, 1):
+            survivor.set_target(Tile.instances[future_tile_num])
+            survivor.rotate(pi * 3 / 2)
+            survivor.vel = Vector(0, Options.speed)
 
     if keys[pygame.K_d]:  # East
         future_tile_num = survivor.get_number() + 1
-        if Tile.on_screen(2, future_tile_num):
-            future_tile = Tile.instances[future_tile_num]
-            if future_tile.walkable or "trans" in Drop.actives:
-                survivor.set_target(future_tile)
-                survivor.rotate(0)
-                survivor.vel = Vector(Options.speed, 0)
+        if can_walk(survivor.get_number(), future_tile_num, 2):
+            survivor.set_target(Tile.instances[future_tile_num])
+            survivor.rotate(0)
+            survivor.vel = Vector(Options.speed, 0)
 
     if keys[pygame.K_a]:  # West
         future_tile_num = survivor.get_number() - 1
-        if Tile.on_screen(3, future_tile_num):
-            future_tile = Tile.instances[future_tile_num]
-            if future_tile.walkable or "trans" in Drop.actives:
-                survivor.set_target(future_tile)
-                survivor.rotate(pi)
-                survivor.vel = Vector(-Options.speed, 0)
+        if can_walk(survivor.get_number(), future_tile_num, 3):
+            survivor.set_target(Tile.instances[future_tile_num])
+            survivor.rotate(pi)
+            survivor.vel = Vector(-Options.speed, 0)
+
+
+def switch_gun(survivor):
+    survivor.current_gun += 1
+    survivor.current_gun %= 4  # loop 0, 1, 2, 3
 
 
-def other(screen, survivor):
+def other(screen, survivor, replaying=False):
+    """Handle the events
+    :param replaying: If True, the keys that change the game are ignored, see ReplayInput"""
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
+        if event.type == pygame.VIDEOEXPOSE:  # The window must be drawn again
+            RenderQueue.full = True
         if event.type == pygame.KEYDOWN:
             logging.info("key %s", pygame.key.name(event.key))
-            if event.key == pygame.K_e:
-                survivor.current_gun += 1
-                survivor.current_gun %= 4  # loop 0, 1, 2, 3
+            if event.key == pygame.K_e and not replaying:
+                switch_gun(survivor)
 
             if event.key == pygame.K_p:
                 pause(screen, Zombie.level)
+            if event.key == pygame.K_F3:
+                Profiler.toggle()
 
             if event.key == pygame.K_ESCAPE:
                 game_over(screen, Zombie.level)
             if event.key == pygame.K_c and pygame.key.get_mods() & pygame.KMOD_CTRL:
                 pygame.quit()
                 sys.exit()
-            if (Options.debug and event.key == pygame.K_r and
+            if (Options.debug and not replaying and event.key == pygame.K_r and
                     pygame.key.get_mods() & pygame.KMOD_CTRL):
                 full_ammo(survivor)
 
@@ -103,8 +115,12 @@ def shooting(survivor, keys: List[int]):
                survivor.current_gun, survivor)
 
 
-def interaction(screen, survivor):
-    other(screen, survivor)
-    keys = pygame.key.get_pressed()
+def interaction(screen, survivor, keys=None):
+    """Handle events and move and shoot with the keys pressed
+    :param keys: The pressed keys like pygame.key.get_pressed(), see inputs.py.
+    If None, the events are handled and the keyboard is read"""
+    if keys is None:
+        other(screen, survivor)
+        keys = pygame.key.get_pressed()
     walking(survivor, keys)
     shooting(survivor, keys)
@@ -1,5 +1,8 @@
 """This file initiate the game"""
+import atexit
 import logging
+import math
+import time
 from contextlib import redirect_stdout
 with redirect_stdout(None):  # To remove the pygame hello message
     import pygame
@@ -7,53 +10,176 @@ with redirect_stdout(None):  # To remove the pygame hello message
 import init as _
 from options import Options
 from init_screen import main; main()  # This must run before tile.py is run
-from miscellaneous import text, game_over
+from miscellaneous import text, game_over, stats, NullSurface
 from zombie import Zombie
 from survivor import Survivor
 from bullet import Bullet
 from pickup import PickUp
 from interaction import interaction
+from inputs import LiveInput, ScriptedInput, Recorder, ReplayInput
 from tile import Tile
 from drop import Drop
 from color import BLACK
 from astar import AStar
+from planner import Planner
+from baseclass import BaseClass
+from profiler import Profiler
+from renderqueue import RenderQueue
+from rng import rng
 
 pygame.mixer.music.load("assets/Audio/Other/theme.mp3")
 pygame.mixer.music.set_volume(Options.volume)
 
+MAX_STEPS_PER_FRAME = 5  # Simulated frames to catch up before drawing, the game slows down after that
+# More if a frame is drawn less often than every MAX_STEPS_PER_FRAME simulated frames, see main_loop
 display = pygame.display.set_mode(Options.screen_size)
+# What the game is drawn on. At night it is darkened onto the display, see Survivor.night_mode
+canvas = pygame.Surface(Options.screen_size).convert() if Options.night else display
 
 
 def main():
     """initiate tiles, survival, clock and start music and run main loop"""
+    source = get_source()
+    rng.seed(Options.seed)  # Again, everything until now is the same in every game
+    logging.info("seed: %s", Options.seed)
+    if Options.pitch_black:
+        Options.loopcolor = BLACK  # Before Tile.create draws the map
     Tile.create()
+    if Options.pathfinding == "astar":
+        AStar.load_table()
+    if Options.planner != "sync":  # Loads the table too
+        Planner.start(Options.planner)
+        atexit.register(Planner.stop)
+    if Options.night and Options.precompute_light:
+        Survivor.precompute_light()
     survivor = Survivor(*Tile.random_open_tile())
     clock = pygame.time.Clock()
-    if Options.pitch_black:
-        Options.loopcolor = BLACK
     logging.info("options: %s", Options.__dict__)
     logging.info("monitor: w=%s, h=%s", Options.monitor_w, Options.monitor_h)
+    if Options.trace is not None:
+        atexit.register(Profiler.export, Options.trace)
+    if Options.headless:
+        headless_loop(survivor, source)
+        pygame.quit()
+        return
     pygame.mixer.music.play(loops=-1)
-    main_loop(survivor, clock)
+    main_loop(survivor, clock, source)
     game_over(display, Zombie.level)
 
 
-def main_loop(survivor, clock):
+def get_source():
+    """Return where the keys come from, see inputs.py. --record records any source.
+    The seed and the amount of frames of a replay are set by Options"""
+    if Options.replay is not None:
+        source = ReplayInput.from_file(Options.replay)
+    elif Options.headless:
+        source = ScriptedInput.from_file(Options.script)
+    else:
+        source = LiveInput()
+    if Options.record is not None:
+        source = Recorder(source, Options.record)
+        atexit.register(source.close)
+    return source
+
+
+def step(screen, survivor, total_frames, keys=None):
+    """Simulate one frame, without drawing anything
+    :param keys: The pressed keys, read from the keyboard if None, see interaction"""
+    stage = Profiler.stage
+    with stage("input"):
+        interaction(screen, survivor, keys)
+    with stage("bullets"):
+        Bullet.update()
+    with stage("zombies"):
+        Zombie.update(survivor)
+    with stage("pickups"):
+        PickUp.update(survivor, total_frames)
+    with stage("drops"):
+        Drop.update(survivor)
+    with stage("survivor"):
+        survivor.movement()
+    with stage("spawn"):
+        Zombie.spawn(total_frames, survivor)
+
+
+def draw(survivor, clock):
+    """Draw everything on the display, see RenderQueue"""
+    if Options.night:
+        survivor.draw_torch()
+    Drop.draw_all(canvas)
+    PickUp.draw_all(canvas)
+    Bullet.draw_all(canvas)
+    Zombie.draw_all(canvas)
+    survivor.draw(canvas)
+    if Options.night:
+        survivor.night_mode(display, canvas)
+    text(display, survivor.health, Zombie.left_round + len(Zombie.instances),
+         clock.get_fps(), Zombie.level, survivor.ammo, Drop.actives)
+    Profiler.draw(display)
+
+
+def main_loop(survivor, clock, source):
+    """Run until the survivor dies, or Options.frames frames have passed
+    The game is simulated Options.fps times per second no matter how often it is drawn.
+    Every time it is drawn, it is simulated as many times as it should have been since
+    the last time, up to MAX_STEPS_PER_FRAME, or one more than the simulated frames
+    between two drawn frames with a low --render_fps. Between two simulated frames,
+    everything is drawn part of the way from where it was to where it is, see BaseClass.draw_pos
+    :param source: Where the keys come from, see inputs.py
+    :return: the number of frames simulated"""
+    total_frames = 0
+    stage = Profiler.stage
+    step_time = 1 / Options.fps
+    max_steps = MAX_STEPS_PER_FRAME
+    if Options.render_fps:  # So the game doesn't slow down because of the cap on drawing
+        max_steps = max(max_steps, math.ceil(Options.fps / Options.render_fps) + 1)
+    lag = step_time  # Time not simulated yet, the first frame is simulated at once
+    last_time = time.perf_counter()
+    while survivor.health > 0 and total_frames != Options.frames:
+        now = time.perf_counter()
+        lag = min(lag + now - last_time, step_time * max_steps)
+        last_time = now
+        with stage("clear"):
+            RenderQueue.clear(canvas)
+        while lag >= step_time and survivor.health > 0 and total_frames != Options.frames:
+            BaseClass.remember_positions(Bullet.instances, Zombie.instances, (survivor,))
+            with stage("poll"):
+                keys = source.poll(display, survivor)
+            step(display, survivor, total_frames, keys)
+            lag -= step_time
+            total_frames += 1
+        BaseClass.interpolation = lag / step_time
+        with stage("draw"):
+            draw(survivor, clock)
+        with stage("wait"):
+            clock.tick(Options.render_fps)
+        with stage("update"):
+            RenderQueue.update()
+        Profiler.end_frame()
+    return total_frames
+
+
+def headless_loop(survivor, source):
+    """main_loop without drawing, sound or waiting for the next frame
+    Runs until the survivor dies or Options.frames frames have passed
+    :param source: Where the keys come from, see inputs.py
+    :return: the number of frames simulated"""
+    screen = NullSurface()
     total_frames = 0
-    while survivor.health > 0:
-        Tile.draw_all(display)
-        interaction(display, survivor)
-        Bullet.update(display)
-        Zombie.update(display, survivor)
-        PickUp.update(display, survivor, total_frames)
-        Drop.update(display, survivor)
-        survivor.update(display)
-        Zombie.spawn(display, total_frames, survivor)
-        text(display, survivor.health, Zombie.left_round + len(Zombie.instances),
-             clock.get_fps(), Zombie.level, survivor.ammo, Drop.actives)
-        clock.tick(Options.fps)
-        pygame.display.flip()
+    start = time.perf_counter()
+    while survivor.health > 0 and total_frames != Options.frames:
+        with Profiler.stage("poll"):
+            keys = source.poll(screen, survivor)
+        step(screen, survivor, total_frames, keys)
+        Profiler.end_frame()
         total_frames += 1
+    seconds = time.perf_counter() - start
+    summary = ("frames: {0}, seconds: {1:.2f}, frames per second: {2:.1f}, "
+               "round: {3}, stats: {4}").format(
+        total_frames, seconds, total_frames / seconds, Zombie.level, stats)
+    logging.info(summary)
+    print(summary)
+    return total_frames
 
 
 if __name__ == "__main__":
@@ -0,0 +1,207 @@
+"""Parse a map once, and keep it in a binary file so it doesn't have to be parsed again"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import List, Tuple
+
+CACHE_DIR = "assets/Maps/compiled"
+MAGIC, VERSION = b"ZSMP", 1
+HEADER = struct.Struct("<4sH20sHHIIIII")
+# magic, version, hash of the map file, columns, rows, and the amount of zombie spawns,
+# pick-up spawns, solid runs, walls and neighbours in the sections after the header
+
+
+@dataclass
+class CompiledMap:
+    """Everything Options, Tile, Zombie and PickUp need from a map file, in tiles
+    and tile numbers, so it doesn't depend on the tile length.
+    CompiledMap.load reads it from CACHE_DIR, in a file named by the hash of the map
+    file, and parses the map file and writes the cache file if it isn't there.
+    The cache file is a HEADER followed by sections of unsigned 32 bit ints, in
+    the order of the attributes below, except solid, which is one bit per tile
+    Params:
+    cols: The amount of tiles horizontally
+    rows: The amount of tiles vertically
+    solid: True for every tile which is a wall, "#" in the map file
+    zombie_spawns: The numbers of the tiles zombies spawn on, "Z" in the map file
+    pickup_spawns: The numbers of the tiles pick-ups spawn on, "P" in the map file
+    solid_runs: (first tile, length) of every row of solids next to each other, see Tile.compress_solids
+    walls: (x1, y1, x2, y2) of the edges between solid and open tiles, see Tile.build_walls
+    adjacency_start: See adjacency
+    adjacency: The walkable neighbours of every tile, see Tile.build_adjacency
+    digest: The hash of the map file, empty if it wasn't loaded from a file. Not in the cache file
+    Example:
+    >>> compiled = CompiledMap.compile("#Z.\\nP.#")
+    >>> compiled.cols, compiled.rows, compiled.solid
+    (3, 2, [True, False, False, False, False, True])
+    >>> compiled.zombie_spawns, compiled.pickup_spawns, compiled.solid_runs
+    ([1], [3], [(0, 1), (5, 1)])
+    >>> CompiledMap.from_bytes(compiled.to_bytes(bytes(20)), bytes(20)) == compiled
+    True"""
+    cols: int
+    rows: int
+    solid: List[bool]
+    zombie_spawns: List[int]
+    pickup_spawns: List[int]
+    solid_runs: List[Tuple[int, int]]
+    walls: List[Tuple[int, int, int, int]]
+    adjacency_start: List[int]
+    adjacency: List[int]
+    digest: bytes = field(default=b"", compare=False, repr=False)
+
+    @classmethod
+    def compile(cls, text: str) -> "CompiledMap":
+        """Parse the text of a map file"""
+        cols = text.find("\n")
+        if cols == -1:  # If the file is one line
+            cols = len(text)
+        rows = text.count("\n") + 1  # +1 because there is no "\n" on the last line
+        chars = text.replace("\n", "")
+        solid = [char == "#" for char in chars]
+        solid_runs = []
+        for row in range(rows):  # A new run starts at a new row
+            start = row * cols
+            for is_solid, group in groupby(solid[start:start + cols]):
+                length = len(list(group))
+                if is_solid:
+                    solid_runs.append((start, length))
+                start += length
+        return cls(cols, rows, solid,
+                   [i for i, char in enumerate(chars) if char == "Z"],
+                   [i for i, char in enumerate(chars) if char == "P"],
+                   solid_runs, cls.find_walls(solid, cols, rows),
+                   *cls.find_adjacency(solid, cols, rows))
+
+    @staticmethod
+    def find_walls(solid, cols: int, rows: int):
+        """Return the edges of the map and the edges between solid and open tiles as
+        (x1, y1, x2, y2) in tiles. Edges next to each other on the same line are merged"""
+        walls = [(0, 0, cols, 0), (cols, 0, cols, rows), (cols, rows, 0, rows), (0, rows, 0, 0)]
+        for row in range(1, rows):  # The lines between two rows
+            def is_edge(col):
+                return solid[(row - 1) * cols + col] != solid[row * cols + col]
+            for edge, group in groupby(range(cols), key=is_edge):
+                if edge:
+                    group = list(group)
+                    walls.append((group[0], row, group[-1] + 1, row))
+        for col in range(1, cols):  # The lines between two columns
+            def is_edge(row):
+                return solid[row * cols + col - 1] != solid[row * cols + col]
+            for edge, group in groupby(range(rows), key=is_edge):
+                if edge:
+                    group = list(group)
+                    walls.append((col, group[0], col, group[-1] + 1))
+        return walls
+
+    @staticmethod
+    def find_adjacency(solid, cols: int, rows: int):
+        """Return adjacency_start and adjacency, the numbers of the walkable tiles
+        north, south, east and west of every tile, solid or not"""
+        amount = cols * rows
+        adjacency_start, adjacency = [0], []
+        for num in range(amount):
+            col = num % cols
+            for neighbour, inside in ((num - cols, num >= cols), (num + cols, num + cols < amount),
+                                      (num + 1, col != cols - 1), (num - 1, col != 0)):
+                if inside and not solid[neighbour]:
+                    adjacency.append(neighbour)
+            adjacency_start.append(len(adjacency))
+        return adjacency_start, adjacency
+
+    def to_bytes(self, digest: bytes) -> bytes:
+        """Return the cache file of self, digest is the hash of the map file"""
+        bits = bytearray((len(self.solid) + 31) // 32 * 4)  # Padded to a whole int
+        for i, is_solid in enumerate(self.solid):
+            if is_solid:
+                bits[i >> 3] |= 1 << (i & 7)
+        ints = array("I", self.zombie_spawns + self.pickup_spawns)
+        for section in (self.solid_runs, self.walls):
+            for item in section:
+                ints.extend(item)
+        ints.extend(self.adjacency_start)
+        ints.extend(self.adjacency)
+        header = HEADER.pack(MAGIC, VERSION, digest, self.cols, self.rows, len(self.zombie_spawns),
+                             len(self.pickup_spawns), len(self.solid_runs), len(self.walls), len(self.adjacency))
+        return header + bytes(bits) + ints.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, digest: bytes) -> "CompiledMap":
+        """Read a cache file made by to_bytes, data can be a memory map of it.
+        Raise ValueError if it wasn't made from the map file with the hash digest"""
+        magic, version, file_digest, cols, rows, *counts = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or file_digest != digest:
+            raise ValueError("The compiled map is outdated")
+        n_zombies, n_pickups, n_runs, n_walls, n_adjacency = counts
+        amount = cols * rows
+        n_bits = (amount + 31) // 32 * 4
+        lengths = (n_zombies, n_pickups, n_runs * 2, n_walls * 4, amount + 1, n_adjacency)
+        if len(data) != HEADER.size + n_bits + 4 * sum(lengths):
+            raise ValueError("The compiled map is truncated or too long")
+        with memoryview(data) as view, view[HEADER.size + n_bits:].cast("I") as ints:
+            bits = view[HEADER.size:HEADER.size + n_bits].tobytes()
+            sections = []
+            start = 0
+            for length in lengths:
+                sections.append(ints[start:start + length].tolist())
+                start += length
+        solid = [bool(bits[i >> 3] >> (i & 7) & 1) for i in range(amount)]
+        zombies, pickups, runs, walls, adjacency_start, adjacency = sections
+        return cls(cols, rows, solid, zombies, pickups, list(zip(runs[::2], runs[1::2])),
+                   list(zip(walls[::4], walls[1::4], walls[2::4], walls[3::4])), adjacency_start, adjacency,
+                   digest)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledMap":
+        """Return the map in path from the cache if it is there and up to date, else parse it"""
+        with open(path, "rb") as file:
+            source = file.read()
+        digest = hashlib.sha1(source).digest()
+        cache_path = os.path.join(CACHE_DIR, digest.hex() + ".bin")
+        try:
+            with open(cache_path, "rb") as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return cls.from_bytes(mapped, digest)
+        except (OSError, ValueError, struct.error):  # Not in the cache, or an old or broken file
+            pass
+        compiled = cls.compile(source.decode().replace("\r\n", "\n"))  # Like reading in text mode
+        compiled.digest = digest
+        try:
+            write_cache(cache_path, compiled.to_bytes(digest))
+        except OSError as e:  # Can't write there, parse it every time
+            logging.warning("couldn't cache %s: %s", path, e)
+        return compiled
+
+
+def list_maps(folder: str = "assets/Maps") -> List[str]:
+    """Return the file names of the maps in folder, sorted. Only the .txt files,
+    not the compiled maps in CACHE_DIR
+    >>> "Pac-Man.txt" in list_maps()
+    True"""
+    return sorted(name for name in os.listdir(folder)
+                  if name.endswith(".txt") and os.path.isfile(os.path.join(folder, name)))
+
+
+def write_cache(path: str, data: bytes):
+    """Write data to the file path in CACHE_DIR. It is written to a temporary file which
+    then replaces path, so path is never half written, even if two games write it at once"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    file = tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False)
+    try:
+        with file:
+            file.write(data)
+        os.replace(file.name, path)
+    except OSError:
+        os.remove(file.name)
+        raise
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -1,14 +1,15 @@
 """Defines a Vector class, and some mathematical functions"""
 
 from math import cos, sin, atan2, sqrt, pi
-from random import randrange, random, uniform
+from random import randrange
 from dataclasses import dataclass
 import logging
 
+from rng import rng
+
 SMALL_PRIMES = {2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
                 53, 59, 61, 67, 71, 73, 79, 83, 89, 97}
 
-@dataclass
 class Vector:
     """Create a 2d Vector
 
@@ -57,17 +58,61 @@ class Vector:
     >>> a, b = Vector(2, 3), Vector(4, 1)
     >>> assert a < b
     >>> a, b = Vector(0, 1), Vector(0, -1)
-    >>> assert a != b"""
-    x: float
-    y: float
+    >>> assert a != b
+
+    A Vector is equal to a tuple or list with the same x and y
+    >>> Vector(3, 4) == (3, 4)
+    True
+
+    Vector has __slots__, so it has no __dict__ and can't get new attributes.
+    Arithmetic checks for another Vector first, then for a tuple or list, then
+    for an int or float and lastly for any other sequence, as that is the order
+    they are most common in the game.
+    The methods ending in _ip change the vector in place, like pygame.Rect.move_ip,
+    and take x and y as numbers, to avoid creating a new Vector or tuple"""
+    __slots__ = "x", "y"
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+    def __repr__(self):
+        return "Vector(x=%r, y=%r)" % (self.x, self.y)
+
+    def __eq__(self, other):
+        if type(other) is Vector:
+            return self.x == other.x and self.y == other.y
+        if isinstance(other, (tuple, list)) and len(other) == 2:
+            return self.x == other[0] and self.y == other[1]
+        return NotImplemented
+
+    __hash__ = None  # Vectors are mutable
+
+    def __getstate__(self):
+        return self.x, self.y
+
+    def __setstate__(self, state):
+        self.x, self.y = state
 
     def __iter__(self):
         yield self.x
         yield self.y
 
     def __getitem__(self, idx):
+        if idx == 0:
+            return self.x
+        if idx == 1:
+            return self.y
         return (self.x, self.y)[idx]
 
+    def __setitem__(self, idx, value):
+        if idx in (0, -2):
+            self.x = value
+        elif idx in (1, -1):
+            self.y = value
+        else:
+            raise IndexError("Vector index out of range")
+
     def __len__(self):
         return 2
 
@@ -75,46 +120,96 @@ class Vector:
     def random_unit_vector(cls):
         """A random vector on the unit circle. its lengtth is always 1"""
         v = cls(1, 0)
-        a = random() * 2 * pi
+        a = rng.random() * 2 * pi
         v.rotate(a)
         return v
 
     def __add__(self, other):
-        if hasattr(other, "__getitem__"):
+        type_ = type(other)
+        if type_ is Vector:
+            return Vector(self.x + other.x, self.y + other.y)
+        if type_ is tuple or type_ is list:
             return Vector(self.x + other[0], self.y + other[1])
-        else:
+        if type_ is int or type_ is float or isinstance(other, (int, float)) or not hasattr(other, "__getitem__"):
             return Vector(self.x + other, self.y + other)
+        return Vector(self.x + other[0], self.y + other[1])
 
     __radd__ = __add__
 
     def __iadd__(self, other):
-        if hasattr(other, "__getitem__"):
+        type_ = type(other)
+        if type_ is Vector:
+            self.x += other.x
+            self.y += other.y
+        elif type_ is tuple or type_ is list:
             self.x += other[0]
             self.y += other[1]
-        else:
+        elif type_ is int or type_ is float or isinstance(other, (int, float)) or not hasattr(other, "__getitem__"):
             self.x += other
             self.y += other
+        else:
+            self.x += other[0]
+            self.y += other[1]
         return self
 
     def __sub__(self, other):
-        if hasattr(other, "__getitem__"):
+        type_ = type(other)
+        if type_ is Vector:
+            return Vector(self.x - other.x, self.y - other.y)
+        if type_ is tuple or type_ is list:
             return Vector(self.x - other[0], self.y - other[1])
-        else:
+        if type_ is int or type_ is float or isinstance(other, (int, float)) or not hasattr(other, "__getitem__"):
             return Vector(self.x - other, self.y - other)
+        return Vector(self.x - other[0], self.y - other[1])
 
     def __rsub__(self, other):
         if hasattr(other, "__getitem__"):
             return Vector(other[0] - self.x, other[1] - self.y)
-        else:
-            return Vector(other - self.x, other - self.y)
+        return Vector(other - self.x, other - self.y)
 
     def __isub__(self, other):
-        if hasattr(other, "__getitem__"):
+        type_ = type(other)
+        if type_ is Vector:
+            self.x -= other.x
+            self.y -= other.y
+        elif type_ is tuple or type_ is list:
             self.x -= other[0]
             self.y -= other[1]
-        else:
+        elif type_ is int or type_ is float or isinstance(other, (int, float)) or not hasattr(other, "__getitem__"):
             self.x -= other
             self.y -= other
+        else:
+            self.x -= other[0]
+            self.y -= other[1]
+        return self
+
+    def set_ip(self, x: float, y: float):
+        """Set x and y in place and return self
+        >>> v = Vector(1, 2)
+        >>> v.set_ip(3, 4) is v
+        True
+        >>> v
+        Vector(x=3, y=4)"""
+        self.x = x
+        self.y = y
+        return self
+
+    def add_ip(self, x: float, y: float):
+        """Add x and y to self in place and return self, without a Vector or tuple for the operand
+        >>> Vector(1, 2).add_ip(3, -4)
+        Vector(x=4, y=-2)"""
+        self.x += x
+        self.y += y
+        return self
+
+    def scale_ip(self, scalar_or_x, y=None):
+        """self.scale, but in place
+        >>> Vector(1, 2).scale_ip(3)
+        Vector(x=3, y=6)"""
+        if y is None:
+            y = scalar_or_x
+        self.x *= scalar_or_x
+        self.y *= y
         return self
 
     def scale(self, scalar_or_x, y=None):
@@ -149,7 +244,7 @@ class Vector:
         >>> a.y = 2
         >>> b
         Vector(x=1, y=0)"""
-        return Vector(*self)
+        return Vector(self.x, self.y)
 
     __copy__ = copy
 
@@ -13,9 +13,11 @@ import pygame
 
 import init as _
 from options import Options
-from maths import Vector
 from color import Color, WHITE, BLACK
 from tile import Tile
+from profiler import Profiler
+from renderqueue import RenderQueue
+from assets import Assets
 
 stats = {"Zombies Killed": 0,
          "Bullets Fired": 0,
@@ -55,9 +57,26 @@ new_dir_func = OrderedDict((
 # because pygame doesn't allow negative angles
 
 
-def rotated(img, new_dir):
-    """img rotated new_dir radians"""
-    return new_dir_func[new_dir](img)
+class SpriteAtlas:
+    """Every direction of the images that turn, rotated once when they are loaded
+    so turning costs a lookup instead of a transform.
+    The images of a direction are in SpriteAtlas.sprites[sprite_id, direction],
+    where direction is a key in new_dir_func
+    Example:
+    >>> SpriteAtlas.add("example", [pygame.Surface((2, 1))])
+    >>> SpriteAtlas.sprites[("example", 0), math.pi].get_size()
+    (2, 1)
+    >>> SpriteAtlas.sprites[("example", 0), math.pi / 2].get_size()
+    (1, 2)"""
+    sprites = {}  # (sprite_id, direction) -> image
+
+    @classmethod
+    def add(cls, name: str, imgs):
+        """Add every direction of every image in imgs, with (name, index in imgs) as the sprite_id"""
+        for i, img in enumerate(imgs):
+            for direction, func in new_dir_func.items():
+                cls.sprites[(name, i), direction] = func(img)
+                Profiler.count("surfaces")
 
 
 def further_than(tile_idx, survivor, min_dist):
@@ -67,17 +86,15 @@ def further_than(tile_idx, survivor, min_dist):
     return dist > min_dist
 
 
-def scale(img, size=Tile.size):
-    if isinstance(size, Vector):
-        return pygame.transform.scale(img, size.as_ints())
-    else:
-        return pygame.transform.scale(img, size)
-
-
 font = pygame.font.Font("assets/Fonts/ModifiedDeadFontWalking.otf",
                         Options.width // 30)
 
-text_render = partial(lambda x, y, z: font.render(x, y, z), y=1, z=WHITE)
+
+def text_render(text_):
+    Profiler.count("surfaces")
+    return font.render(text_, 1, WHITE)
+
+
 *_, text_width, text_height = text_render("T").get_rect()
 
 lifes_text = get_text("info", "lifes")
@@ -92,24 +109,25 @@ logging.info("font size: %s, text_height: %s, text_width: %s",
 
 def text(screen, health, len_zombies, fps, level, ammo, power_ups):
     """Writes all the text during the standard game loop"""
+    blit = partial(RenderQueue.blit, screen)
     lifes_text_f = lifes_text.format(math.ceil(health))
-    screen.blit(text_render(lifes_text_f), (0, 0))
+    blit(text_render(lifes_text_f), (0, 0))
     zombies_left_text_f = zombies_left_text.format(len_zombies)
-    screen.blit(text_render(zombies_left_text_f),
-                (text_width * len(lifes_text_f) + Options.width // 25, 0))
+    blit(text_render(zombies_left_text_f),
+         (text_width * len(lifes_text_f) + Options.width // 25, 0))
     round_text_f = round_text.format(level)
-    screen.blit(text_render(round_text_f),
-                (Options.width - text_width * len(round_text_f), 0))
+    blit(text_render(round_text_f),
+         (Options.width - text_width * len(round_text_f), 0))
     ammo_text_f = ammo_text.format(ammo)
-    screen.blit(text_render(ammo_text_f), (
+    blit(text_render(ammo_text_f), (
         Options.width - text_width * len(ammo_text_f),
         Options.height - text_height))
     fps_text_f = fps_text.format("{0:.2f}".format(fps))
-    screen.blit(text_render(fps_text_f), (0, Options.height - text_height))
+    blit(text_render(fps_text_f), (0, Options.height - text_height))
     power_up_text_f = power_up_text.format(
         [get_text("drops", d) for d in power_ups])
-    screen.blit(text_render(power_up_text_f),
-                (0, Options.height - text_height * 2))
+    blit(text_render(power_up_text_f),
+         (0, Options.height - text_height * 2))
 
 
 def pause(screen, level: int):
@@ -196,8 +214,7 @@ def game_over(screen, level: int):
         raise ValueError("Couldn't fit the text on the screen. text_width: {},"
                          "width / 2: {}".format(accuracy.get_rect().width,
                                                 Options.width / 2))
-    game_over_img = pygame.image.load("assets/Images/Other/game_over2.png")
-    scaled_img = scale(game_over_img, (Options.width, Options.height // 2))
+    scaled_img = Assets.image("assets/Images/Other/game_over2.png", (Options.width, Options.height // 2))
     y_interval = Options.height // 6
     level_pos = Options.width // 15, Options.height // 4
     high_score_pos = Options.width // 2, Options.height // 4
@@ -221,6 +238,16 @@ def game_over(screen, level: int):
     sys.exit()
 
 
+class NullSurface:
+    """A stand-in for the screen that ignores everything drawn on it, used by --headless"""
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        return pygame.Rect(0, 0, 0, 0)
+
+    def fill(self, color, rect=None, special_flags=0):
+        return pygame.Rect(0, 0, 0, 0)
+
+
 class NextRoundCountdown:
     """A countdown between rounds
     params:
@@ -236,8 +263,10 @@ class NextRoundCountdown:
         self.time_passed = 0
         self.text_x, self.text_y = None, None
 
-    def update(self, screen):
+    def update(self):
         self.time_passed += 1
+
+    def draw(self, screen):
         start_angle = math.pi / 2
         proportion = self.time_passed / self.finished
         end_angle = -math.pi * (4 * proportion - 5) / 2
@@ -245,8 +274,8 @@ class NextRoundCountdown:
         x = Options.width // 2 - diameter // 2
         y = Options.height // 2 - diameter // 2
         rect = x, y, diameter, diameter
-        pygame.draw.arc(screen, NextRoundCountdown.wheel_color, rect,
-                        start_angle, end_angle, diameter // 5)
+        RenderQueue.mark(pygame.draw.arc(screen, NextRoundCountdown.wheel_color, rect,
+                                         start_angle, end_angle, diameter // 5))
         time_left = (self.finished - self.time_passed) / Options.fps
         formatted = "{0}".format(int(time_left) + 1)
         text_ = get_text("info", "next_round").format(formatted)
@@ -256,7 +285,7 @@ class NextRoundCountdown:
         if self.text_x is None:
             self.text_x = Options.width // 2 - rendered.get_rect().width // 2
             self.text_y = Options.height // 2 - rendered.get_rect().height // 2
-        screen.blit(rendered, (self.text_x, self.text_y))
+        RenderQueue.blit(screen, rendered, (self.text_x, self.text_y))
 
 
 if __name__ == "__main__":
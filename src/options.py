@@ -5,15 +5,25 @@ import argparse
 import warnings
 import sys
 import os
+import struct
 import subprocess
 from random import randrange
 
 from maths import isprime
+from rng import rng
+from mapcache import CompiledMap, list_maps
 from color import Color, LIGHT_GREY, DARK_GREY, BLACK
 
+REPLAY_MAGIC, REPLAY_VERSION = b"ZSRP", 1
+REPLAY_HEADER = struct.Struct("<4sBQHHH")
+# magic, version, seed, tile length, fps and the length of the name of the map after the header
+REPLAY_FRAME = struct.Struct("<H")  # Bit i is set if the i-th key in inputs.KEYS is pressed
+
 
 def get_resolution():
     """Get resoltution of the screen"""
+    if _args.headless:
+        return 1280, 720  # No screen, same as when xrandr fails below
     if sys.platform in {"darwin", "win32", "cygwin"}:
         # MacOS and Windows
         # This takes a screenshot and returns its size
@@ -44,14 +54,29 @@ def get_resolution():
             os.remove("resolution.txt")  # deletes the file
 
 
+def read_replay_header(path: str):
+    """Return the seed and the amount of frames of the replay at path, see inputs.Recorder.
+    Raise ValueError if it isn't a replay"""
+    with open(path, "rb") as file:
+        header = file.read(REPLAY_HEADER.size)
+    if len(header) < REPLAY_HEADER.size:
+        raise ValueError("Not a replay made by --record")
+    magic, version, seed, _, _, length = REPLAY_HEADER.unpack(header)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError("Not a replay made by --record")
+    return seed, (os.path.getsize(path) - REPLAY_HEADER.size - length) // REPLAY_FRAME.size
+
+
 def view_maps():
-    print("\n".join(os.listdir("assets/Maps/")))
+    print("\n".join(list_maps()))
     sys.exit()
 
 
 parser = argparse.ArgumentParser("Zombie Survival")
 parser.add_argument("-f", "--fps", nargs="?", type=int, default=60,
-                    help="The FPS cap")
+                    help="How many times per second the game is simulated. Every speed is in pixels per simulated frame")
+parser.add_argument("-rf", "--render_fps", nargs="?", type=int, default=None,
+                    help="The FPS cap of drawing, independent of --fps. 0 draws as fast as possible. Defaults to --fps")
 parser.add_argument("-m", "--map", nargs="?", default="Pac-Man",
                     help="The map, available maps are in the Maps-folder")
 parser.add_argument("-v", "--volume", nargs="?", type=float, default=0.3,
@@ -74,9 +99,36 @@ parser.add_argument("-t", "--torch_darkness", nargs="?", type=int, default=128,
                     help="How dark the torch is; between 0 and 255, where 255 is completely dark")
 parser.add_argument("-np", "--n_points", nargs="?", type=int, default=100,
                     help="The number of points to make up the polygon which finds the players view")
+parser.add_argument("-ne", "--night_engine", nargs="?", default="dda",
+                    choices=("dda", "shadow", "march"),
+                    help="How night mode finds what the player sees; \"dda\" steps from tile to tile along every line of sight, \"shadow\" finds the exact outline from the corners of the walls, both need NumPy. \"march\" moves along the lines of sight by --line_incr")
 parser.add_argument("-li", "--line_incr", nargs="?", type=float, default=None,
                     help="How much to increment the sightline between checks. High number makes it go through corners. Low numbers is less efficient. Defaults to tile length / 10")
 
+parser.add_argument("-pf", "--pathfinding", nargs="?", default="flowfield",
+                    choices=("flowfield", "astar"),
+                    help="How zombies find the survivor; \"flowfield\" shares one search between all zombies, \"astar\" searches once per zombie")
+parser.add_argument("--planner", nargs="?", default="sync",
+                    choices=("sync", "thread", "process"),
+                    help="Where A* searches, see planner.py; \"sync\" when a zombie needs a path, \"thread\" and \"process\" on a pool while the frame is drawn, and the zombie gets the path on the next frame")
+parser.add_argument("-pt", "--path_table", nargs="?", default="auto",
+                    choices=("auto", "next_hop", "landmarks", "off"),
+                    help="The table of distances A* uses, see pathtable.py; \"next_hop\" looks up paths instead of searching, \"landmarks\" makes the search shorter. \"auto\" uses next_hop on small maps. Used with -pf astar and --planner")
+
+parser.add_argument("--script", nargs="?", default=None,
+                    help="Script of keys to press with --headless, see inputs.py. Defaults to walking around and shooting")
+parser.add_argument("--frames", nargs="?", type=int, default=None,
+                    help="How many frames to play. Defaults to until the survivor dies, or the end of the replay")
+parser.add_argument("--seed", nargs="?", type=int, default=None,
+                    help="Seed of the random numbers in the game, from 0 to 2**64 - 1 as it is stored in --record. Defaults to a random seed, which is logged")
+parser.add_argument("--record", nargs="?", default=None,
+                    help="Record the seed and the keys pressed every frame to this file, see inputs.py")
+parser.add_argument("--replay", nargs="?", default=None,
+                    help="Play a file made by --record again, with the same seed and keys. Add -H to play it as fast as possible")
+
+parser.add_argument("--trace", nargs="?", default=None,
+                    help="Write how long every stage of the last minute of frames took to this file on exit. A CSV file if it ends with .csv, else a Chrome trace")
+
 parser.add_argument("--help_maps", action="store_true", help="View available maps")
 
 flags = parser.add_argument_group()
@@ -92,10 +144,18 @@ flags.add_argument("-s", "--opensettings", action="store_true",
                    help="Open settings automatically")
 flags.add_argument("-S", "--skip_intro", action="store_true", help="skip intro screen")
 flags.add_argument("-n", "--night", action="store_true", help="Use night mode")
+flags.add_argument("-P", "--precompute_light", action="store_true",
+                   help="Find what the player sees from every tile when the game starts, instead of the first time the player is there")
 flags.add_argument("-p", "--pitch_black", action="store_true",
                    help="It is pitch black")
 flags.add_argument("-r", "--random_tile_color", action="store_true", help="random tile colors")
+flags.add_argument("-H", "--headless", action="store_true",
+                   help="Simulate the game as fast as possible without a window, sound or keyboard. Implies -S and -M")
+flags.add_argument("-N", "--numpy", action="store_true",
+                   help="Keep the zombies in NumPy arrays, faster with many zombies. NumPy must be installed")
 _args, unknown = parser.parse_known_args()
+if _args.headless:
+    _args.skip_intro = _args.mute = True
 
 
 # noinspection PyAttributeOutsideInit
@@ -117,14 +177,34 @@ class _Options:
         self.not_log = _args.not_log
         self.night = _args.night
         self.n_points = _args.n_points
+        self.night_engine = _args.night_engine
+        self.precompute_light = _args.precompute_light
+        self.pathfinding = _args.pathfinding
+        self.path_table = _args.path_table
+        self.planner = _args.planner
+        self.numpy = _args.numpy
+        self.headless = _args.headless
+        self.script = _args.script
+        self.frames = _args.frames
+        self.render_fps = self.fps if _args.render_fps is None else _args.render_fps
+        self.seed = randrange(2 ** 32) if _args.seed is None else _args.seed
+        self.record = _args.record
+        self.replay = _args.replay
+        if self.replay is not None and os.path.isfile(self.replay):
+            # Seeded like the recorded game before anything draws from rng,
+            # and it can't be played for more frames than were recorded
+            self.seed, recorded_frames = read_replay_header(self.replay)
+            self.frames = recorded_frames if self.frames is None else min(self.frames, recorded_frames)
+        rng.seed(self.seed)
+        self.trace = _args.trace
         if _args.line_incr is None:
             self.line_increment = self._tilelength / 10
         else:
             self.line_increment = _args.line_incr
         self.set_language(_args.language)
         if _args.random_tile_color:
-            self.fillcolor = Color(*(randrange(0, 256) for _ in range(3)))
-            self.loopcolor = Color(*(randrange(0, 256) for _ in range(3)))
+            self.fillcolor = Color(*(rng.randrange(0, 256) for _ in range(3)))
+            self.loopcolor = Color(*(rng.randrange(0, 256) for _ in range(3)))
         else:
             self.fillcolor = Color(_args.fillcolor)
             self.loopcolor = Color(_args.loopcolor)
@@ -166,16 +246,8 @@ class _Options:
     def setmapname(self, new: str):
         self._mapname = new
         self.mappath = "assets/Maps/{}".format(self.mapname)
-        with open(self.mappath) as file:
-            file_str = file.read()
-            if file_str.endswith("\n"):
-                file_str.rstrip("\n")
-            self.tiles_x = file_str.find("\n")
-            if self.tiles_x == -1:
-                # If the file is one line
-                self.tiles_x = len(file_str)
-            self.tiles_y = file_str.count("\n") + 1
-            # +1 because there is no "\n" on the last line
+        self.compiled_map = CompiledMap.load(self.mappath)  # Used by Tile, Zombie and PickUp
+        self.tiles_x, self.tiles_y = self.compiled_map.cols, self.compiled_map.rows
         if hasattr(self, "_tilelength"):
             self.update_size()
 
@@ -232,6 +304,7 @@ class _Options:
         # TODO: Translate to English
         assert os.path.isfile(self.mappath), self.mappath + " finnes ikke.."
         assert 10 < self.fps < 180, "FPS må være mellom 10 og 180."
+        assert self.render_fps >= 0, "-rf kan ikke være negativ"
         assert 0 <= self.volume <= 1, "Volumet må være mellom 0 or 1, inkludert 0 og 1."
         assert 11 < self.tile_length < 100, "Flislengden må være mellom 11 og 100."
         assert not isprime(
@@ -242,6 +315,9 @@ class _Options:
         assert self.line_increment > 0, "-li må være et positivt tall"
         assert 0 <= self.torch_darkness <= 255, "-dl må være mellom 0 og 255"
         assert 0 <= self.night_darkness <= 255, "-tl må være mellom 0 og 255"
+        assert self.replay is None or self.script is None, "--script kan ikke brukes med --replay"
+        assert self.replay is None or os.path.isfile(self.replay), self.replay + " finnes ikke.."
+        assert 0 <= self.seed < 2 ** 64, "--seed må være mellom 0 og 2**64 - 1"
 
     def warnings(self):
         # TODO: Translate to English
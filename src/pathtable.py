@@ -0,0 +1,221 @@
+"""Distances between the tiles of a map, computed once per map and kept next to the
+compiled map, so AStar doesn't have to search, or searches much less"""
+
+import logging
+import os
+import struct
+from array import array
+from collections import deque
+from operator import sub
+from time import perf_counter
+
+import mapcache
+
+MAGIC, VERSION = b"ZSPT", 1
+HEADER = struct.Struct("<4sH20sBHI")
+# magic, version, hash of the map file, index of the kind in KINDS, the amount of
+# landmarks and the amount of open tiles, followed by the table as unsigned 16 bit ints
+KINDS = ("next_hop", "landmarks")
+UNREACHABLE = 0xFFFF
+
+
+class PathTable:
+    """A table of a map for AStar, of one of two kinds:
+    "next_hop": For every pair of open tiles, the next tile on the shortest path
+    between them, so a path is found with one lookup per step and no search.
+    It takes 2 bytes per pair, so it is only made for small maps.
+    "landmarks": The distance in steps from a few landmark tiles, spread out over
+    the map, to every open tile. By the triangle inequality the distance between
+    two tiles is at least the difference of their distances to a landmark, which
+    is a much better heuristic for A* than the Manhattan distance when there are
+    walls in the way. This is known as ALT, A* with landmarks and the triangle inequality.
+    Only the active_landmarks landmarks giving the largest bound between the start and
+    the end of a search are used in it, as the heuristic is called for every tile pushed.
+    The tables are made with breadth first searches, in the same order as FlowField.update.
+    Open tiles are numbered from 0 in the order of the tile numbers, see opens and index
+    Params:
+    compiled: The CompiledMap the table is of
+    kind: One of KINDS
+    table: The table as an array of unsigned shorts, made from compiled if it is None.
+    For next_hop, table[end * len(opens) + start] is the next open tile from start towards end,
+    for landmarks, table[tile * landmarks + landmark] is the distance from landmark to tile.
+    UNREACHABLE where there is no path
+    Example:
+    >>> compiled = mapcache.CompiledMap.compile("...\\n.#.\\n...")
+    >>> table = PathTable(compiled, "next_hop")
+    >>> table.path(0, 8)
+    [8, 5, 2, 1]
+    >>> table = PathTable(compiled, "landmarks")
+    >>> table.landmarks, table.bound(0, 8)(0), table.bound(0, 8)(5)
+    (8, 4, 1)"""
+    all_pairs_limit = 2048  # Maps with more open tiles than this get landmarks with "auto", 8 MB
+    landmark_count = 8
+    active_landmarks = 2
+    current = None  # The table returned last by PathTable.of
+
+    def __init__(self, compiled, kind: str, table=None):
+        assert kind in KINDS, kind
+        self.compiled = compiled
+        self.kind = kind
+        self.opens = array("l", (num for num, is_solid in enumerate(compiled.solid) if not is_solid))
+        self.index = array("l", [-1]) * len(compiled.solid)  # -1 for solid tiles
+        for i, num in enumerate(self.opens):
+            self.index[num] = i
+        self.landmarks = 0 if kind == "next_hop" else min(PathTable.landmark_count, len(self.opens))
+        self.table = self.build() if table is None else table
+
+    def breadth_first(self, source: int):
+        """Yield the number of every tile that can be reached from the tile number source,
+        the number of the tile it was reached from and its distance from source.
+        source is yielded first, reached from itself"""
+        adjacency, adjacency_start = self.compiled.adjacency, self.compiled.adjacency_start
+        seen = bytearray(len(self.index))
+        seen[source] = 1
+        queue = deque(((source, 0),))
+        yield source, source, 0
+        while queue:
+            num, steps = queue.popleft()
+            steps += 1
+            for i in range(adjacency_start[num], adjacency_start[num + 1]):
+                sur_num = adjacency[i]
+                if not seen[sur_num]:
+                    seen[sur_num] = 1
+                    queue.append((sur_num, steps))
+                    yield sur_num, num, steps
+
+    def build(self) -> array:
+        """Return the table of self.kind"""
+        start = perf_counter()
+        opens, index, n = self.opens, self.index, len(self.opens)
+        if self.kind == "next_hop":
+            table = array("H", [UNREACHABLE]) * (n * n)
+            for end, end_num in enumerate(opens):
+                row = end * n
+                for num, from_num, _ in self.breadth_first(end_num):
+                    table[row + index[num]] = index[from_num]
+        else:
+            k = self.landmarks
+            table = array("H", [UNREACHABLE]) * (n * k)
+            # The distance to the closest landmark so far, or from the first open tile
+            # before there are landmarks. The tile farthest away is the next landmark
+            nearest = array("l", [UNREACHABLE]) * n
+            for num, _, steps in self.breadth_first(opens[0]) if n else ():
+                nearest[index[num]] = steps
+            for landmark in range(k):
+                farthest = max(range(n), key=nearest.__getitem__)
+                for num, _, steps in self.breadth_first(opens[farthest]):
+                    i = index[num]
+                    table[i * k + landmark] = steps
+                    if landmark == 0 or steps < nearest[i]:
+                        nearest[i] = steps
+                if landmark == 0:  # The tiles it can't reach are farther away than every tile
+                    for i in range(n):
+                        if table[i * k] == UNREACHABLE:
+                            nearest[i] = UNREACHABLE
+        logging.info("built the %s path table of %s open tiles in %.3f s",
+                     self.kind, n, perf_counter() - start)
+        return table
+
+    def path(self, start: int, end: int):
+        """Return the shortest path from the tile number start to end, like SearchSpace.search.
+        Return None if self has no next hops, or if start or end is solid"""
+        index = self.index
+        start_i, end_i = index[start], index[end]
+        if self.kind != "next_hop" or start_i == -1 or end_i == -1:
+            return None
+        table, opens = self.table, self.opens
+        row = end_i * len(opens)
+        if table[row + start_i] == UNREACHABLE:
+            return []
+        path = []
+        i = start_i
+        while i != end_i:
+            i = table[row + i]
+            path.append(opens[i])
+        path.reverse()
+        return path
+
+    def bound(self, start: int, end: int):
+        """Return a function returning the largest difference between the distances from a
+        landmark to the tile number end and to a tile number, which is at least 0 and at most
+        the amount of steps between them. It is 0 for solid tiles and if self has no landmarks.
+        The landmarks used are the ones with the largest difference for the tile number start"""
+        k, table, index = self.landmarks, self.table, self.index
+        start_i, end_i = index[start] * k, index[end] * k
+        if k == 0 or end_i < 0:
+            return lambda num: 0
+        active = range(k)
+        if start_i >= 0:
+            active = sorted(active, key=lambda landmark: -abs(table[end_i + landmark] - table[start_i + landmark]))
+        active = tuple(active[:PathTable.active_landmarks])
+        ends = tuple(table[end_i + landmark] for landmark in active)
+
+        def lower_bound(num: int) -> int:
+            i = index[num] * k
+            if i < 0:
+                return 0
+            return max(map(abs, map(sub, ends, [table[i + landmark] for landmark in active])))
+        return lower_bound
+
+    def to_bytes(self) -> bytes:
+        """Return the cache file of self"""
+        header = HEADER.pack(MAGIC, VERSION, self.compiled.digest, KINDS.index(self.kind),
+                             self.landmarks, len(self.opens))
+        return header + self.table.tobytes()
+
+    @classmethod
+    def from_bytes(cls, compiled, kind: str, data) -> "PathTable":
+        """Read a cache file made by to_bytes. Raise ValueError if it isn't of kind
+        with the current landmark_count, or wasn't made from compiled"""
+        magic, version, digest, kind_index, landmarks, n_opens = HEADER.unpack_from(data)
+        if (magic != MAGIC or version != VERSION or digest != compiled.digest or
+                KINDS[kind_index] != kind or n_opens != compiled.solid.count(False)):
+            raise ValueError("The path table is outdated")
+        table = array("H")
+        table.frombytes(data[HEADER.size:])
+        path_table = cls(compiled, kind, table)
+        length = n_opens * (n_opens if kind == "next_hop" else path_table.landmarks)
+        if landmarks != path_table.landmarks or len(table) != length:
+            raise ValueError("The path table is outdated")
+        return path_table
+
+    @classmethod
+    def load(cls, compiled, kind: str) -> "PathTable":
+        """Return the table of compiled from mapcache.CACHE_DIR if it is there and up to date,
+        else build it and write it there. It is only written if compiled is from a map file"""
+        if not compiled.digest:
+            return cls(compiled, kind)
+        cache_path = os.path.join(mapcache.CACHE_DIR, "{}.{}.bin".format(compiled.digest.hex(), kind))
+        try:
+            with open(cache_path, "rb") as file:
+                return cls.from_bytes(compiled, kind, file.read())
+        except (OSError, ValueError, IndexError, struct.error):  # Not in the cache, or an old or broken file
+            pass
+        path_table = cls(compiled, kind)
+        try:
+            mapcache.write_cache(cache_path, path_table.to_bytes())
+        except OSError as e:  # Can't write there, build it every time
+            logging.warning("couldn't cache the path table: %s", e)
+        return path_table
+
+    @classmethod
+    def of(cls, compiled, kind: str = "auto") -> "PathTable":
+        """Return the table of compiled, which is loaded the first time it is asked for.
+        kind is one of KINDS or "auto", which is next_hop for maps with at most
+        all_pairs_limit open tiles and landmarks for larger ones"""
+        current = cls.current
+        if current is not None and current.compiled is compiled and kind in ("auto", current.kind):
+            return current
+        if kind == "auto":
+            kind = "next_hop" if compiled.solid.count(False) <= cls.all_pairs_limit else "landmarks"
+        cls.current = cls.load(compiled, kind)
+        return cls.current
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+    # Build the tables of every map ahead of time, so the first game on a map doesn't have to
+    from glob import glob
+    for map_path in sorted(glob("assets/Maps/*.txt")):
+        PathTable.of(mapcache.CompiledMap.load(map_path))
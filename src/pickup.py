@@ -1,6 +1,4 @@
 from functools import partial
-from random import random, randint, choice
-import pygame
 
 import init as _
 from baseclass import BaseClass
@@ -10,7 +8,12 @@ try:
     from cython_ import collide
 except ImportError:
     from python_ import collide
-from miscellaneous import further_than, scale
+from miscellaneous import further_than
+from assets import Assets
+from spatialhash import SpatialHash
+from profiler import Profiler
+from renderqueue import RenderQueue
+from rng import rng
 from tile import Tile
 
 
@@ -29,26 +32,25 @@ class PickUp(BaseClass):
 
     TODO: Add more pick ups"""
 
-    with open(Options.mappath) as file:
-        spawn_tiles = [
-            i for i, x in enumerate(file.read().replace("\n", "")) if x == "P"
-        ]
+    spawn_tiles = list(Options.compiled_map.pickup_spawns)  # A copy, it changes during the game
 
     init_round, left_round = 4, 4
     zombie_init_round = None
 
-    images = {"ammo": scale(pygame.image.load("assets/Images/PickUps/ammo.png")),
-              "health": scale(pygame.image.load("assets/Images/PickUps/health.png"))}
-    sounds = {"ammo": pygame.mixer.Sound("assets/Audio/PickUp/ammo_short.ogg"),
-              "health": pygame.mixer.Sound("assets/Audio/PickUp/health.ogg")}
+    images = {"ammo": Assets.image("assets/Images/PickUps/ammo.png", Tile.size),
+              "health": Assets.image("assets/Images/PickUps/health.png", Tile.size)}
+    sounds = {"ammo": Assets.sound("assets/Audio/PickUp/ammo_short.ogg"),
+              "health": Assets.sound("assets/Audio/PickUp/health.ogg")}
     sounds["ammo"].set_volume(Options.volume)
     sounds["health"].set_volume(Options.volume)
     instances = set()
+    grid = SpatialHash()
 
     def __init__(self, x, y, spawn_tile, type_):
         super().__init__(x, y)
         PickUp.instances.add(self)
-        self.incr = randint(20, 35)
+        PickUp.grid.insert(self)
+        self.incr = rng.randint(20, 35)
         self.spawn_tile = spawn_tile
         self.type = "ammo" if type_ < 2 / 3 else "health"
         PickUp.spawn_tiles.remove(spawn_tile)
@@ -62,13 +64,13 @@ class PickUp(BaseClass):
                 return
             pos_spawn_tiles.extend(cls.spawn_tiles)
         cls.left_round -= 1
-        type_ = random()
-        spawn_tile = choice(pos_spawn_tiles)
+        type_ = rng.random()
+        spawn_tile = rng.choice(pos_spawn_tiles)
         spawn_node = Tile.instances[spawn_tile]
         cls(*spawn_node.pos, spawn_tile, type_)
 
     @classmethod
-    def update(cls, screen, survivor, total_frames):
+    def update(cls, survivor, total_frames):
         if cls.left_round:
             try:
                 if total_frames % ((Options.fps * cls.zombie_init_round * 2) //
@@ -78,18 +80,25 @@ class PickUp(BaseClass):
                 if total_frames % Options.fps * 10 == 0:
                     cls.spawn(survivor)
         del_pick_up = set()
-        for pick_up in cls.instances:
-            screen.blit(cls.images[pick_up.type], pick_up.pos.as_ints())
+        candidates = cls.grid.query(survivor)
+        Profiler.count("collision tests", len(candidates))
+        for pick_up in candidates:
             if collide(*pick_up.pos, *pick_up._size, *survivor.pos, *survivor._size):
                 setattr(survivor, pick_up.type,
                         getattr(survivor, pick_up.type) + pick_up.incr)
                 cls.sounds[pick_up.type].play()
                 cls.spawn_tiles.append(pick_up.spawn_tile)
                 del_pick_up.add(pick_up)
-                del pick_up
 
+        for pick_up in del_pick_up:
+            cls.grid.remove(pick_up)
         cls.instances -= del_pick_up
 
+    @classmethod
+    def draw_all(cls, screen):
+        for pick_up in cls.instances:
+            RenderQueue.blit(screen, cls.images[pick_up.type], pick_up.pos.as_ints())
+
 
 if __name__ == "__main__":
     Tile.create()
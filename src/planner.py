@@ -0,0 +1,151 @@
+"""Search for the paths of zombies on a pool of threads or processes, see --planner"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from astar import AStar, SearchSpace
+from options import Options
+from tile import Tile
+
+
+class GridSnapshot(namedtuple("GridSnapshot", "cols adjacency_start adjacency table")):
+    """The walkable tiles of the map as tuples, which the workers search in. It is
+    made when the pool is started and never changed, so the workers don't need locks
+    and don't depend on Tile, which isn't set up in a process
+    Params:
+    cols: The amount of tiles horizontally, Options.tiles_x
+    adjacency_start, adjacency: See Tile.build_adjacency
+    table: The PathTable of the map, or None with --path_table off"""
+    __slots__ = ()
+
+    def neighbours(self, num: int):
+        """Tile.neighbours in the snapshot"""
+        return self.adjacency[self.adjacency_start[num]:self.adjacency_start[num + 1]]
+
+    def plan(self, space: SearchSpace, start: int, end: int) -> list:
+        """Find the path from start to end like AStar.solve does when the path can't be repaired"""
+        if self.table is not None:
+            path = self.table.path(start, end)
+            if path is not None:
+                return path
+        bound = None if self.table is None or not self.table.landmarks else self.table.bound(start, end)
+        end_y, end_x = divmod(end, self.cols)
+
+        def heuristic(num: int) -> int:  # AStar.get_heuristic
+            y, x = divmod(num, self.cols)
+            manhattan = abs(end_x - x) + abs(end_y - y)
+            return manhattan if bound is None else max(manhattan, bound(num))
+        return space.search(start, end, self.neighbours, heuristic)
+
+
+_snapshot = None  # The GridSnapshot of the workers, set by _start_worker
+_local = threading.local()  # The SearchSpace of each worker thread
+
+
+def _start_worker(snapshot: GridSnapshot):
+    global _snapshot
+    _snapshot = snapshot
+
+
+def _plan_all(pairs) -> list:
+    """Return the path of every (start, end) in pairs, run by a worker"""
+    space = getattr(_local, "space", None)
+    if space is None:
+        space = _local.space = SearchSpace(len(_snapshot.adjacency_start) - 1)
+    return [_snapshot.plan(space, start, end) for start, end in pairs]
+
+
+class Planner:
+    """Searches for the paths AStar can't repair on a pool of workers, instead of in
+    Zombie.update. The searches asked for in one frame are sent to the pool at the end
+    of Zombie.update, and given to the zombies at the start of the next one, while the
+    frame is drawn. It waits for them if they aren't done by then, so a game plays the
+    same with threads and processes and any amount of workers, and can be replayed.
+    A zombie keeps following its old path until the new one is given to it. The new path
+    is cut short to where the zombie is heading then, or thrown away if it isn't on it.
+    With "thread" the workers share the GIL with the game, so they only run in parallel
+    with it while it waits for pygame, but "process" starts a process for every worker,
+    which runs in parallel on a machine with more cores
+    Example:
+    >>> Tile.create()
+    >>> Planner.start("thread")
+    >>> zombie = BaseClass(*Tile.instances[2 * Options.tiles_x + 1].pos)
+    >>> zombie.path, zombie.path_end, zombie.repairs, zombie.to = [], None, 0, None
+    >>> Planner.request(zombie, zombie.get_tile(), Tile.instances[2 * Options.tiles_x + 2])
+    >>> Planner.flush(); Planner.collect()
+    >>> zombie.path == [Tile.instances[2 * Options.tiles_x + 2]]
+    True
+    >>> Planner.stop(); Tile.delete()"""
+    workers = max(1, min(4, (os.cpu_count() or 1) - 1))  # One core is left for the game
+    pool = None  # The executor while the planner is running
+    requests = {}  # zombie -> (start tile, end tile), asked for this frame
+    batches = []  # (requests, future) sent to the pool last frame
+
+    @classmethod
+    def start(cls, kind: str):
+        """Start a pool of workers of kind "thread" or "process" on a snapshot of the map.
+        Processes are forked where it is possible, so they don't import the game again"""
+        cls.stop()
+        AStar.load_table()
+        snapshot = GridSnapshot(Options.tiles_x, tuple(Tile.adjacency_start), tuple(Tile.adjacency), AStar.table)
+        if kind == "thread":
+            cls.pool = ThreadPoolExecutor(cls.workers, "planner", _start_worker, (snapshot,))
+        else:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            cls.pool = ProcessPoolExecutor(cls.workers, context, _start_worker, (snapshot,))
+        AStar.planner = cls
+        logging.info("planner: %s %ss", cls.workers, kind)
+
+    @classmethod
+    def stop(cls):
+        """Wait for the workers to finish and stop them, if they are running"""
+        if cls.pool is not None:
+            cls.pool.shutdown()
+            cls.pool = None
+        cls.requests, cls.batches = {}, []
+        AStar.planner = None
+
+    @classmethod
+    def request(cls, zombie, start: Tile, end: Tile):
+        """Ask for the path of zombie from start to end, unless it has been asked for
+        in this frame. It is sent to the workers with the others on flush"""
+        if zombie not in cls.requests:
+            cls.requests[zombie] = start, end
+
+    @classmethod
+    def flush(cls):
+        """Send the requests of this frame to the workers, split evenly between them"""
+        if not cls.requests:
+            return
+        requests = list(cls.requests.items())
+        cls.requests = {}
+        size = -(-len(requests) // cls.workers)  # Rounded up
+        for i in range(0, len(requests), size):
+            batch = requests[i:i + size]
+            pairs = [(start.number, end.number) for _, (start, end) in batch]
+            cls.batches.append((batch, cls.pool.submit(_plan_all, pairs)))
+
+    @classmethod
+    def collect(cls):
+        """Give the zombies the paths sent to the workers last frame, waiting for them if necessary"""
+        batches, cls.batches = cls.batches, []
+        for batch, future in batches:
+            for (zombie, (start, end)), nums in zip(batch, future.result()):
+                path = [Tile.instances[num] for num in nums]
+                heading = zombie.path[-1] if zombie.to is not None and zombie.path else zombie.get_tile()
+                if heading is not start:  # The zombie has followed its old path since it was asked for
+                    if heading not in path:
+                        continue  # It is asked for again when the zombie arrives at a tile
+                    del path[path.index(heading) + 1:]
+                zombie.path, zombie.path_end, zombie.repairs = path, end, 0
+
+
+if __name__ == "__main__":
+    import doctest
+    from baseclass import BaseClass
+    doctest.testmod()
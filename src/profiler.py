@@ -0,0 +1,154 @@
+"""Time every stage of the game loop and count the work done each frame"""
+
+import csv
+import json
+import logging
+from collections import deque, Counter
+from time import perf_counter
+
+import pygame
+
+import init as _
+from options import Options
+from renderqueue import RenderQueue
+
+
+class _Stage:
+    """A context manager timing one stage of the frame, see Profiler.stage"""
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *exc_info):
+        Profiler.current.append((self.name, self.start, perf_counter() - self.start))
+
+
+class Profiler:
+    """Keep the time of every stage of the last frames in a ring buffer,
+    together with counters like the amount of A* expansions in that frame.
+    The stages are timed with:
+    >>> with Profiler.stage("zombies"):
+    ...     pass
+    >>> Profiler.count("collision tests", 3)
+    >>> Profiler.end_frame()
+    >>> stages, counters = Profiler.frames[-1]
+    >>> [name for name, start, duration in stages], counters
+    (['zombies'], {'collision tests': 3})
+
+    F3 shows a graph of the time of every stage the last frames, stacked on top
+    of each other, and --trace writes the frames in the buffer to a file on exit"""
+    frames = deque(maxlen=Options.fps * 60)  # (stages, counters) of the last minute
+    current = []  # (name, start, duration) of the stages of this frame
+    counters = Counter()  # The counters of this frame
+    _stages = {}  # name -> _Stage
+    visible = False
+    graph_size = 300, 120  # One column of pixels per frame
+    graph_ms = 2 * 1000 / Options.fps  # The frame time at the top of the graph
+    graph = None
+    legend = None
+    palette = ((230, 25, 75), (60, 180, 75), (255, 225, 25), (0, 130, 200),
+               (245, 130, 48), (145, 30, 180), (70, 240, 240), (240, 50, 230),
+               (210, 245, 60), (250, 190, 190), (0, 128, 128), (170, 110, 40))
+    colors = {}  # stage name -> color, given in the order the stages are first seen
+
+    @classmethod
+    def stage(cls, name: str) -> _Stage:
+        try:
+            return cls._stages[name]
+        except KeyError:
+            stage = cls._stages[name] = _Stage(name)
+            cls.colors[name] = cls.palette[len(cls.colors) % len(cls.palette)]
+            return stage
+
+    @classmethod
+    def count(cls, name: str, n: int = 1):
+        """Add n to the counter name of this frame"""
+        cls.counters[name] += n
+
+    @classmethod
+    def end_frame(cls):
+        """Put this frame in the buffer and start a new one"""
+        cls.frames.append((cls.current, dict(cls.counters)))
+        if cls.visible:
+            cls.scroll_graph()
+        cls.current = []
+        cls.counters.clear()
+
+    @classmethod
+    def toggle(cls):
+        cls.visible = not cls.visible
+        if cls.visible:  # Draw the frames that happened while the graph was hidden
+            cls.graph = pygame.Surface(cls.graph_size, pygame.SRCALPHA)
+            font = pygame.font.Font(None, 16)
+            cls.legend = [font.render(name, True, color) for name, color in cls.colors.items()]
+            for stages, _ in list(cls.frames)[-cls.graph_size[0]:]:
+                cls.scroll_graph(stages)
+
+    @classmethod
+    def scroll_graph(cls, stages=None):
+        """Move the graph one pixel to the left and draw the stages of a frame
+        in the rightmost column, the last frame if stages is None"""
+        if stages is None:
+            stages = cls.current
+        width, height = cls.graph_size
+        graph = cls.graph
+        graph.scroll(-1, 0)
+        graph.fill((0, 0, 0, 160), (width - 1, 0, 1, height))
+        bottom = height
+        for name, _, duration in stages:
+            top = bottom - duration * 1000 / cls.graph_ms * height
+            pygame.draw.line(graph, cls.colors[name], (width - 1, bottom), (width - 1, top))
+            bottom = top
+        graph.set_at((width - 1, height // 2), (255, 255, 255))  # The time of one frame at Options.fps
+
+    @classmethod
+    def draw(cls, screen):
+        """Draw the graph and the name of every stage in its color in the bottom right corner"""
+        if not cls.visible:
+            return
+        width, height = cls.graph_size
+        x, y = Options.width - width, Options.height - height
+        RenderQueue.blit(screen, cls.graph, (x, y))
+        for rendered in cls.legend:
+            y -= rendered.get_height()
+            RenderQueue.blit(screen, rendered, (x, y))
+
+    @classmethod
+    def export(cls, path: str):
+        """Write the frames in the buffer to path, as a CSV file if it ends
+        with .csv, else as a Chrome trace which can be opened in chrome://tracing"""
+        frames = list(cls.frames)
+        if path.endswith(".csv"):
+            stages = list(cls.colors)
+            counters = sorted({name for _, frame_counters in frames for name in frame_counters})
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["frame"] + ["{} (ms)".format(name) for name in stages] + counters)
+                for i, (frame_stages, frame_counters) in enumerate(frames):
+                    durations = dict.fromkeys(stages, 0.)
+                    for name, _, duration in frame_stages:
+                        durations[name] += duration * 1000
+                    writer.writerow([i] + [round(durations[name], 4) for name in stages] +
+                                    [frame_counters.get(name, 0) for name in counters])
+        else:
+            events = []
+            for frame_stages, frame_counters in frames:
+                for name, start, duration in frame_stages:
+                    events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                                   "ts": start * 1e6, "dur": duration * 1e6})
+                if frame_stages and frame_counters:
+                    events.append({"name": "counters", "ph": "C", "pid": 1,
+                                   "ts": frame_stages[0][1] * 1e6, "args": frame_counters})
+            with open(path, "w") as file:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        logging.info("wrote %s frames to %s", len(frames), path)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
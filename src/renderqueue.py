@@ -0,0 +1,89 @@
+"""Keep track of what is drawn on the screen, so only that has to be updated"""
+
+import pygame
+
+import init as _
+from tile import Tile
+
+
+class RenderQueue:
+    """Collect the rects drawn on the screen this frame, so the display only
+    has to be updated where something was drawn this frame or the last frame.
+    Everything drawn in the game loop must go through RenderQueue.blit or
+    RenderQueue.mark. A frame goes like this:
+    RenderQueue.clear(screen)  # Draw the map over what was drawn last frame
+    RenderQueue.blit(screen, img, pos)  # Draw everything
+    RenderQueue.update()  # Update the display where something changed
+    Set RenderQueue.full to update the whole screen next frame, e.g. after a pause"""
+    drawn = []  # The rects drawn on this frame
+    last = []  # The rects drawn on the last frame, they must be cleared
+    full = True  # The first frame draws the whole map
+
+    @classmethod
+    def blit(cls, screen, image, pos, area=None):
+        cls.drawn.append(screen.blit(image, pos, area))
+
+    @classmethod
+    def mark(cls, rect):
+        """Add rect to what was drawn this frame, e.g. the rect returned by pygame.draw"""
+        cls.drawn.append(rect)
+
+    @classmethod
+    def clear(cls, screen):
+        """Draw the map over everything that was drawn last frame"""
+        if cls.full:
+            Tile.draw_all(screen)
+        else:
+            Tile.restore(screen, cls.last)
+
+    @staticmethod
+    def disjoint(rects):
+        """Return rects covering the same pixels as rects, but without overlapping each
+        other, so a transparent surface can be blitted in them without blending any
+        pixel twice. The rects are split into bands between the tops and bottoms of
+        all the rects, and the rects in a band are merged
+        Example:
+        >>> RenderQueue.disjoint([pygame.Rect(0, 0, 20, 20), pygame.Rect(10, 10, 20, 20)])
+        [<rect(0, 0, 20, 10)>, <rect(0, 10, 30, 10)>, <rect(10, 20, 20, 10)>]"""
+        rects = sorted((rect for rect in rects if rect), key=lambda rect: rect.top)
+        edges = sorted({y for rect in rects for y in (rect.top, rect.bottom)})
+        result = []
+        active = []  # The rects in the band
+        growing = {}  # (left, right) -> the rect in result which ends at the top of the band
+        i = 0
+        for top, bottom in zip(edges, edges[1:]):
+            while i < len(rects) and rects[i].top <= top:
+                active.append(rects[i])
+                i += 1
+            active = [rect for rect in active if rect.bottom > top]
+            spans = []
+            for left, right in sorted((rect.left, rect.right) for rect in active):
+                if spans and left <= spans[-1][1]:
+                    spans[-1][1] = max(spans[-1][1], right)
+                else:
+                    spans.append([left, right])
+            below = {}
+            for left, right in spans:
+                rect = growing.get((left, right))
+                if rect is None or rect.bottom != top:
+                    rect = pygame.Rect(left, top, right - left, 0)
+                    result.append(rect)
+                rect.height = bottom - rect.top
+                below[left, right] = rect
+            growing = below
+        return result
+
+    @classmethod
+    def update(cls):
+        """Update the display where something was drawn or cleared, and start a new frame"""
+        if cls.full:
+            pygame.display.flip()
+            cls.full = False
+        else:
+            pygame.display.update(cls.last + cls.drawn)
+        cls.last, cls.drawn = cls.drawn, []
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,16 @@
+"""The random number generator of the whole game. It is seeded with --seed when the
+game starts, so the same seed and the same keys give the same game, see inputs.py
+>>> rng.seed(1)
+>>> a = rng.random()
+>>> rng.seed(1)
+>>> rng.random() == a
+True"""
+
+from random import Random
+
+rng = Random()
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
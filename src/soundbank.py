@@ -0,0 +1,85 @@
+"""Play sounds that are played often on their own mixer channels"""
+
+import logging
+from collections import deque
+
+import pygame
+
+import init as _
+from options import Options
+from assets import Assets
+
+
+class _Category:
+    """The sounds, channels and volume of one category, see SoundBank.add"""
+    __slots__ = ("sounds", "channels", "volume")
+
+    def __init__(self, sounds, channels, volume: float):
+        self.sounds = sounds
+        self.channels = channels  # The channel played on longest ago is first
+        self.volume = volume
+
+
+class SoundBank:
+    """Sounds in categories, like all the gunshots, where every category
+    plays on its own channels. The channels are reserved, so the other sounds
+    and the other categories can't take them, and a gunshot can't stop a
+    zombie from being heard. If every channel of a category is busy, the sound
+    which was started longest ago is stopped, so the newest sound is always heard.
+    The channels in pygame.mixer that aren't reserved are left for Sound.play
+    Example:
+    >>> SoundBank.add("example", ["assets/Audio/Drop/freeze.ogg"], channels=2, volume=0.5)
+    >>> channel = SoundBank.play("example", 0)
+    >>> SoundBank.categories["example"].channels[-1] is channel
+    True"""
+    categories = {}  # name -> _Category
+    reserved = 0  # The amount of channels reserved by the categories
+    free_channels = 8  # The channels that aren't reserved, pygame's default amount
+
+    @classmethod
+    def add(cls, name: str, paths, channels: int, volume: float = 1.):
+        """Add a category of the sounds in paths, which are loaded at once. Its sounds
+        are played on channels channels, at volume times Options.volume.
+        If the category has been added, its sounds and volume are replaced and it keeps its
+        channels. Raise ValueError if it was added with another amount of channels"""
+        sounds = tuple(Assets.sound(path) for path in paths)
+        if name in cls.categories:
+            category = cls.categories[name]
+            if len(category.channels) != channels:
+                raise ValueError("{} has {} channels, not {}".format(name, len(category.channels), channels))
+            category.sounds, category.volume = sounds, volume
+            return
+        first = cls.reserved
+        cls.reserved += channels
+        pygame.mixer.set_num_channels(cls.reserved + cls.free_channels)
+        pygame.mixer.set_reserved(cls.reserved)
+        pool = deque(pygame.mixer.Channel(i) for i in range(first, cls.reserved))
+        cls.categories[name] = _Category(sounds, pool, volume)
+        logging.info("sound bank %s: %s sounds on channel %s to %s",
+                     name, len(sounds), first, cls.reserved - 1)
+
+    @classmethod
+    def play(cls, name: str, index: int) -> pygame.mixer.Channel:
+        """Play the sound number index in the category name, and return the channel it is played on"""
+        category = cls.categories[name]
+        pool = category.channels
+        for channel in pool:
+            if not channel.get_busy():
+                break
+        else:  # Every channel is busy, use the one which has played the longest
+            channel = pool[0]
+        pool.remove(channel)
+        pool.append(channel)
+        channel.set_volume(category.volume * Options.volume)
+        channel.play(category.sounds[index])
+        return channel
+
+    @classmethod
+    def set_volume(cls, name: str, volume: float):
+        """Set the volume of the category name, from the next time one of its sounds is played"""
+        cls.categories[name].volume = volume
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
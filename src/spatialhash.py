@@ -0,0 +1,86 @@
+"""A spatial hash to find the objects that are close to another object"""
+
+from math import ceil
+
+from options import Options
+from tile import Tile
+
+
+class SpatialHash:
+    """Put objects in buckets by the numbers of the tiles they overlap, like
+    Tile.get_number. An object that lies between tiles is in every tile it overlaps.
+    Only the objects in the tiles that an object overlaps can collide with it, so
+    a collision check does not have to be done against every object.
+    The objects must have a pos and a _size like BaseClass"""
+
+    def __init__(self):
+        self.buckets = {}  # tile number -> list of objects
+        self.keys = {}  # object -> tuple of the tile numbers it is in
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, obj):
+        return obj in self.keys
+
+    @staticmethod
+    def tiles(obj) -> tuple:
+        """Return the numbers of the tiles obj overlaps
+        Example:
+        >>> from baseclass import BaseClass
+        >>> Tile.length = 10
+        >>> SpatialHash.tiles(BaseClass(x=5, y=0, width=10, height=5))
+        (0, 1)"""
+        length = Tile.length
+        x, y = obj.pos
+        w, h = obj._size
+        x1 = max(int(x // length), 0)
+        y1 = max(int(y // length), 0)
+        x2 = min(ceil((x + w) / length) - 1, Options.tiles_x - 1)
+        y2 = min(ceil((y + h) / length) - 1, Options.tiles_y - 1)
+        # Minus 1 because the right and bottom edges are not part of obj, see collide
+        if x1 == x2 and y1 == y2:
+            return x1 + y1 * Options.tiles_x,
+        return tuple(col + row * Options.tiles_x
+                     for row in range(y1, y2 + 1) for col in range(x1, x2 + 1))
+
+    def insert(self, obj):
+        keys = self.tiles(obj)
+        self.keys[obj] = keys
+        for key in keys:
+            self.buckets.setdefault(key, []).append(obj)
+
+    def remove(self, obj):
+        for key in self.keys.pop(obj):
+            bucket = self.buckets[key]
+            bucket.remove(obj)
+            if not bucket:
+                del self.buckets[key]
+
+    def move(self, obj):
+        """Update the buckets of obj after it has moved"""
+        if self.tiles(obj) != self.keys[obj]:
+            self.remove(obj)
+            self.insert(obj)
+
+    def clear(self):
+        self.buckets.clear()
+        self.keys.clear()
+
+    def query(self, obj):
+        """Return the objects in the tiles obj overlaps. These are the only
+        objects that can collide with obj. It may include obj itself"""
+        keys = self.tiles(obj)
+        if len(keys) == 1:
+            return self.buckets.get(keys[0], ())
+        found = []
+        for key in keys:
+            for other in self.buckets.get(key, ()):
+                if other not in found:
+                    found.append(other)
+        return found
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -1,4 +1,6 @@
 import logging
+from collections import OrderedDict
+from itertools import count
 from math import pi, radians
 import pygame
 
@@ -6,9 +8,17 @@ import init as _
 from options import Options
 from baseclass import BaseClass
 from maths import Vector, Ray
-from miscellaneous import rotated, scale
+from miscellaneous import SpriteAtlas
+from assets import Assets
 from tile import Tile
 from drop import Drop
+from renderqueue import RenderQueue
+try:
+    import numpy as np
+    from raycast import GridRaycaster
+    from shadow import ShadowCaster
+except ImportError:  # NumPy isn't installed
+    GridRaycaster = ShadowCaster = None
 
 dir2chr = {0: "e", pi: "w", pi * 0.5: "n", pi * 1.5: "s"}
 # Convert dir in radians to cardinal direction (nsew) because of file names
@@ -19,13 +29,13 @@ class Survivor(BaseClass):
     Params:
     x: the x coordinate of the survivor
     y: the y coordinate of the survivor"""
-    guns = (scale(pygame.image.load("assets/Images/Weapons/pistol2.png"), Tile.size.scale(0.5, 0.25)),
-            scale(pygame.image.load("assets/Images/Weapons/shotgun.png"), Tile.size.scale(0.5, 0.25)),
-            scale(pygame.image.load("assets/Images/Weapons/automatic2.png"), Tile.size.scale(0.5, 0.25)),
-            scale(pygame.image.load("assets/Images/Weapons/sniper.png"), Tile.size.scale(0.5, 0.25)))
-    imgs = {d: scale(pygame.image.load(
-        "assets/Images/Players/player_{0}_{1}.png"
-            .format(Options.gender, d))) for d in "nsew"}
+    guns = (Assets.image("assets/Images/Weapons/pistol2.png", Tile.size.scale(0.5, 0.25)),
+            Assets.image("assets/Images/Weapons/shotgun.png", Tile.size.scale(0.5, 0.25)),
+            Assets.image("assets/Images/Weapons/automatic2.png", Tile.size.scale(0.5, 0.25)),
+            Assets.image("assets/Images/Weapons/sniper.png", Tile.size.scale(0.5, 0.25)))
+    SpriteAtlas.add("gun", guns)
+    imgs = {d: Assets.image("assets/Images/Players/player_{0}_{1}.png"
+                            .format(Options.gender, d), Tile.size) for d in "nsew"}
     human_fov = radians(130)  # 130 degrees in radians
     # Information on the internet on the FOV varies vastly. From 100 deg to 200 deg
     # Some sources include our far peripheral vision, some don't, for example.
@@ -40,12 +50,21 @@ class Survivor(BaseClass):
         # Equivalent to numpy.linspace(lower, upper, length)
 
     right_facing_vector = Vector(Options.line_increment, 0)
+    night_engine = Options.night_engine
+    if night_engine != "march" and GridRaycaster is None:
+        night_engine = "march"
+    raycaster = None  # A GridRaycaster of the map, see light_polygon
+    shadow_caster = None  # A ShadowCaster of Tile.walls, see light_polygon
+    light_cache = OrderedDict()  # (tile number, direction, trans) -> points, see cached_light_polygon
+    light_cache_size = 256
     night_surface = pygame.Surface(Options.screen_size, pygame.SRCALPHA)
     if pygame.display.get_surface() is not None:  # Only if the screen has been created
         night_surface.convert()
-    darkness_rect = pygame.Rect(0, 0, Options.width, Options.height)
     darkness_color = (0, 0, 0, Options.night_darkness)
     torch_color = (0, 0, 0, Options.torch_darkness)
+    night_surface.fill(darkness_color)  # Only the torch is drawn on it after this, see draw_torch
+    torch_points = None  # The polygon of the torch on night_surface
+    torch_rect = pygame.Rect(0, 0, 0, 0)  # Where the torch is on night_surface
 
     def __init__(self, x, y):
         self.current_gun = 0
@@ -57,12 +76,6 @@ class Survivor(BaseClass):
         self.init_ammo_count = 100, 50, 150, 50
         self.ammo_count = list(self.init_ammo_count)
 
-    def update(self, screen):
-        self.movement()
-        self.draw(screen)
-        if Options.night:
-            self.night_mode(screen)
-
     def movement(self):
         """If survivor is between two tiles, or self.to hasn"t been updated:
               if survivor is on tile: Set self.to to None
@@ -71,17 +84,18 @@ class Survivor(BaseClass):
             if self.pos == self.to:
                 self.to = None
             else:
-                self.pos += self.vel
+                self.pos.add_ip(self.vel.x, self.vel.y)
 
     def draw(self, screen):
         """Draw survivor and survivor"s gun"""
-        screen.blit(self.img, self.pos.as_ints())
+        x, y = self.draw_pos()
+        RenderQueue.blit(screen, self.img, (x, y))
         w = self.width
         h, q = w >> 1, w >> 2  # fractions of width for placing gun_img
         gun_pos = {pi: (-q, h), 0: (h + q, h), pi * 1.5: (h, w), pi * 0.5: (h, -h)}
-        gun_img = Survivor.guns[self.current_gun]
-        gun_img_rotated = rotated(gun_img, self.direction)
-        screen.blit(gun_img_rotated, (self.pos + gun_pos[self.direction]).as_ints())
+        gun_img_rotated = SpriteAtlas.sprites[("gun", self.current_gun), self.direction]
+        gun_x, gun_y = gun_pos[self.direction]
+        RenderQueue.blit(screen, gun_img_rotated, (x + gun_x, y + gun_y))
 
     def rotate(self, new_dir: float):
         """If new_dir isn't self.direction, update self.img to new_dir
@@ -112,7 +126,69 @@ class Survivor(BaseClass):
         self.to = next_tile.pos
         logging.info("self.pos: %s, self.to: %s", self.to, self.pos)
 
-    def night_mode(self, screen):
+    def draw_torch(self):
+        """Move the torch on night_surface to what the survivor sees,
+        and mark where it was and where it is so night_mode darkens it again"""
+        points = self.cached_light_polygon()
+        if points is Survivor.torch_points:  # Standing still, the polygon is from light_cache
+            return
+        old_rect = Survivor.torch_rect
+        Survivor.night_surface.fill(Survivor.darkness_color, old_rect)
+        new_rect = pygame.draw.polygon(Survivor.night_surface, Survivor.torch_color, points)
+        Survivor.torch_points, Survivor.torch_rect = points, new_rect
+        RenderQueue.mark(old_rect)
+        RenderQueue.mark(new_rect)
+
+    @staticmethod
+    def night_mode(screen, canvas):
+        """Copy canvas to the screen darkened by night_surface, only where something
+        was drawn this frame or the last frame. The rest of the screen was darkened
+        before and hasn't changed since, and darkening it again would make it darker
+        :param canvas: What the game is drawn on, without the darkness"""
+        night_surface = Survivor.night_surface
+        if RenderQueue.full:
+            screen.blit(canvas, (0, 0))
+            screen.blit(night_surface, (0, 0))
+            return
+        for rect in RenderQueue.disjoint(RenderQueue.last + RenderQueue.drawn):
+            # Not RenderQueue.blit, it is already in RenderQueue.drawn or RenderQueue.last
+            screen.blit(canvas, rect, rect)
+            screen.blit(night_surface, rect, rect)
+
+    def cached_light_polygon(self):
+        """light_polygon, but the polygons of the last light_cache_size tiles and
+        directions the survivor stood on are kept, least recently used first.
+        The survivor stands still on a tile most of the time, and then the polygon is the same"""
+        tile = self.get_tile()
+        if self.pos != tile.pos:  # Between two tiles
+            return self.light_polygon()
+        key = tile.number, self.direction, "trans" in Drop.actives
+        cache = Survivor.light_cache
+        try:
+            cache.move_to_end(key)
+            return cache[key]
+        except KeyError:
+            points = cache[key] = self.light_polygon()
+            if len(cache) > Survivor.light_cache_size:
+                cache.popitem(last=False)
+            return points
+
+    @classmethod
+    def precompute_light(cls):
+        """Put the polygon of every open tile and direction in light_cache, used by --precompute_light"""
+        cls.light_cache_size = max(cls.light_cache_size, len(Tile.opens) * 8)  # 4 directions, with and without trans
+        serial = next(BaseClass.serials)
+        for tile in Tile.opens:
+            survivor = cls(*tile.pos)
+            for direction in dir2chr:
+                survivor.direction = direction
+                survivor.cached_light_polygon()
+        BaseClass.serials = count(serial)  # As if they weren't made, so the sets are iterated in the same order with -P
+        logging.info("precomputed %s light polygons", len(cls.light_cache))
+
+    def light_polygon(self):
+        """Return the points of the polygon the survivor can see, starting with its centre.
+        Every point but the first is where a line of sight hits a wall"""
         points = [self.get_centre(),]
         v = Survivor.right_facing_vector
         if "trans" in Drop.actives:
@@ -123,6 +199,18 @@ class Survivor(BaseClass):
                 # scale it by width or height depending on which one is bigger
                 # To ensure that the point is outside of the screen
                 points.append(p)
+        elif Survivor.night_engine == "dda":
+            if Survivor.raycaster is None:
+                solid = np.array(Tile.map_, bool).reshape(Options.tiles_y, Options.tiles_x)
+                Survivor.raycaster = GridRaycaster(solid, Tile.length)
+            angles = self.direction + np.asarray(Survivor.angle_linspace)
+            points.extend(Survivor.raycaster.cast(*points[0], angles).tolist())
+        elif Survivor.night_engine == "shadow":
+            if Survivor.shadow_caster is None:
+                Survivor.shadow_caster = ShadowCaster(Tile.walls)
+            lower = self.direction + Survivor.angle_linspace[0]
+            upper = self.direction + Survivor.angle_linspace[-1]
+            points.extend(Survivor.shadow_caster.polygon(*points[0], lower, upper).tolist())
         else:
             for angle in Survivor.angle_linspace:
                 ray = Ray(self.get_centre(), self.direction + angle)
@@ -133,9 +221,7 @@ class Survivor(BaseClass):
                     ray.pos += increment_vector
                     num = Tile.get_number(ray.pos)
                 points.append(ray.pos)
-        pygame.draw.rect(Survivor.night_surface, Survivor.darkness_color, Survivor.darkness_rect)
-        pygame.draw.polygon(Survivor.night_surface, Survivor.torch_color, points)
-        screen.blit(Survivor.night_surface, (0, 0))
+        return points
 
 
 if __name__ == "__main__":
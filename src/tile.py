@@ -1,7 +1,6 @@
 """Includes a class for tiles"""
 
-import random
-from itertools import groupby
+from array import array
 from textwrap import dedent
 from typing import Container
 
@@ -10,6 +9,7 @@ import pygame
 import init as _
 from options import Options
 from maths import Vector
+from rng import rng
 
 
 
@@ -26,13 +26,15 @@ class Tile:
     345
     678"""
     instances, solids, opens, solids_list, loop_set = [], set(), set(), [], set()
+    NSEW = -Options.tiles_x, Options.tiles_x, 1, -1  # Add to find tile in a direction
+    adjacency, adjacency_start = array("l"), array("l")  # See Tile.build_adjacency
     length = Options.tile_length
     size = Vector(length, length)
     amnt_tiles = 0  # Incremented when a tile is created
+    background = None  # The map drawn once by Tile.create, see Tile.draw_all
+    walls = []  # See Tile.build_walls
 
-    with open(Options.mappath) as file:
-        file_str = file.read()
-        map_ = [x == "#" for x in file_str.replace("\n", "")]
+    map_ = Options.compiled_map.solid
 
     solid_nums = {i for i, x in enumerate(map_) if x}
 
@@ -58,6 +60,9 @@ class Tile:
                 cls(x, y, next(map_gen))
         cls.solids = set(cls.solids_list)
         cls.loop_set = cls.compress_solids()
+        cls.adjacency, cls.adjacency_start = cls.build_adjacency()
+        cls.background = cls.render_background()
+        cls.walls = cls.build_walls()
 
     @classmethod
     def delete(cls):
@@ -66,11 +71,14 @@ class Tile:
         cls.solids = set()
         cls.opens = set()
         cls.loop_set = set()
+        cls.adjacency, cls.adjacency_start = array("l"), array("l")
         cls.amnt_tiles = 0
+        cls.background = None
+        cls.walls = []
 
     @classmethod
     def compress_solids(cls):
-        """returns a comressed cls.solids to be used when drawing
+        """returns a comressed cls.solids to be used when drawing, from Options.compiled_map
         It returns a list of a tuple with the first tile in a long line of solids and
         then how many solids are after it in the line for all lines on the map.
         This makes the drawing much faster,
@@ -88,30 +96,49 @@ class Tile:
         TODO: Make it so the loop_list is the type of tile with the fewest intances
         rtype: set
         """
+        return {(cls.instances[first], length) for first, length in Options.compiled_map.solid_runs}
 
-        splitted_map = zip(*([iter(cls.map_)] * Options.tiles_x))
-        # Split map on every newline
-
-        compressed_map = []
-        # A compressed list with True if solid and False if open
-        # Looks something like this -> [(True, 5), (False, 2), (True, 9), ...]
-        for row in splitted_map:
-            for group in groupby(row):
-                compressed_map.append((group[0], len(list(group[1]))))
-
-        filtered_opens = (j for i, j in compressed_map if i)  # filter open tiles and remove the "True"
-        solids_iter = iter(cls.solids_list)
-        # Map solids onto compressed map
-        loop_set = set()
-        for length, tile in zip(filtered_opens, solids_iter):
-            loop_set.add((tile, length))
-            for _ in range(length - 1):
-                next(solids_iter)
-        return loop_set
+    @classmethod
+    def build_adjacency(cls):
+        """Return the walkable neighbours of every tile as two arrays, like a
+        compressed sparse row matrix. The numbers of the walkable neighbours of
+        tile n are adjacency[adjacency_start[n]:adjacency_start[n + 1]], in the
+        order north, south, east, west. Solid tiles have neighbours too, which is
+        used when the survivor walks through walls. They are from Options.compiled_map
+        example:
+        #..
+        ...
+           |
+           v
+        adjacency = [3, 1, 4, 2, 5, 1, 4, 1, 5, 3, 2, 4]
+        adjacency_start = [0, 2, 4, 6, 7, 10, 12]
+        rtype: tuple of two arrays"""
+        compiled = Options.compiled_map
+        return array("l", compiled.adjacency), array("l", compiled.adjacency_start)
+
+    @classmethod
+    def build_walls(cls):
+        """Return the edges between solid and open tiles, and the edges of the map,
+        as (x1, y1, x2, y2). Edges next to each other on the same line are merged into
+        one, like compress_solids merges solids next to each other.
+        They are from Options.compiled_map, in tiles instead of pixels there.
+        example, with a tile length of 1:
+        #..
+        ...
+           |
+           v
+        [(0, 0, 3, 0), (3, 0, 3, 2), (3, 2, 0, 2), (0, 2, 0, 0), (0, 1, 1, 1), (1, 0, 1, 1)]
+        rtype: list"""
+        length = cls.length
+        return [(x1 * length, y1 * length, x2 * length, y2 * length)
+                for x1, y1, x2, y2 in Options.compiled_map.walls]
+
+    @classmethod
+    def neighbours(cls, tile_num: int):
+        """Return an array of the numbers of the walkable tiles next to tile_num"""
+        return cls.adjacency[cls.adjacency_start[tile_num]:cls.adjacency_start[tile_num + 1]]
 
     def __init__(self, x, y, is_solid):
-        self.parent = None
-        self.h, self.g, self.f = 0, 0, 0
         self.walkable = not is_solid
         self.pos = Vector(x, y)
         self.number = Tile.amnt_tiles
@@ -126,9 +153,9 @@ class Tile:
         return self.number
 
     def __lt__(self, other):
-        """Necesary for the heapq in astar for determeting what path to take if two tiles
-        have equal cost. Current implementation favours the tile with the lowest number.
-        In other words the tile furthest up, and then the one furthest to the left."""
+        """Tiles are ordered by their number. In other words the tile furthest up,
+        and then the one furthest to the left, is the smallest.
+        astar breaks ties between equal costs the same way, but with the numbers themselves"""
         return self.number < other.number
 
     def __eq__(self, other):
@@ -143,7 +170,7 @@ class Tile:
     @classmethod
     def random_open_tile(cls):
         """:return: location of a random walkable tile"""
-        return random.choice(tuple(cls.opens)).pos
+        return rng.choice(tuple(cls.opens)).pos
 
     def get_centre(self):
         """Return a vector of the pos in the centre of the tile
@@ -154,6 +181,11 @@ class Tile:
         return self.pos + Tile.length // 2
 
     def closest_open_tile(self):
+        if self.walkable:
+            return self
+        neighbours = Tile.neighbours(self.number)
+        if neighbours:  # No tile can be closer than a tile next to self
+            return Tile.instances[min(neighbours)]
         return min(Tile.opens,
                    key=lambda x: (self.pos - x.pos).magnitude_squared())
 
@@ -166,18 +198,35 @@ class Tile:
         direction: int of direction in the list NSEW. For example South has index 1.
         tile_num: index of tile in Tile.instances"""
         if direction == 2:  # East
-            return tile_num % Options.tiles_x != 0
+            return tile_num % Options.tiles_x != 0 and tile_num < cls.amnt_tiles
         if direction == 3:  # West
-            return tile_num % Options.tiles_x != Options.tiles_x - 1
-        return 0 <= tile_num <= cls.amnt_tiles  # North and South
+            return tile_num % Options.tiles_x != Options.tiles_x - 1 and tile_num >= 0
+        return 0 <= tile_num < cls.amnt_tiles  # North and South
 
     @classmethod
-    def draw_all(cls, screen):
-        """Fill the screen in light tiles, then draws the solid tiles over"""
-        screen.fill(Options.fillcolor)
+    def render_background(cls):
+        """Return a surface with the whole map. Fill it in light tiles, then draw the
+        solid tiles over. The map doesn't change during a game, so this is only done once"""
+        background = pygame.Surface(Options.screen_size)
+        if pygame.display.get_surface() is not None:  # Only if the screen has been created
+            background = background.convert()
+        background.fill(Options.fillcolor)
         length, loopcolor, draw_rect = cls.length, Options.loopcolor, pygame.draw.rect
         for tile, i in cls.loop_set:
-            draw_rect(screen, loopcolor, (*tile.pos, length * i, length))
+            draw_rect(background, loopcolor, (*tile.pos, length * i, length))
+        return background
+
+    @classmethod
+    def draw_all(cls, screen):
+        """Draw the whole map over everything on the screen"""
+        screen.blit(cls.background, (0, 0))
+
+    @classmethod
+    def restore(cls, screen, rects):
+        """Draw the map over rects only, e.g. where something was drawn last frame"""
+        background = cls.background
+        for rect in rects:
+            screen.blit(background, rect, rect)
 
     @classmethod
     def get_number(cls, pos: Container):
@@ -1,18 +1,26 @@
 import logging
 import math
-from functools import partial
-from random import randint, choice
+from functools import partial, lru_cache
 
 import pygame
 from randomcolor import RandomColor
 
 import init as _
 from astar import AStar
+from flowfield import FlowField
+from planner import Planner
+try:
+    import numpy as np
+    from zombiestore import ZombieStore
+except ImportError:  # NumPy isn't installed
+    ZombieStore = None
 from baseclass import BaseClass
 from maths import Vector
 from options import Options
 from pickup import PickUp
+from spatialhash import SpatialHash
 from color import Color, DARK_RED, BLACK, TRANSPARENT
+from rng import rng
 
 try:
     from cython_ import angle_between
@@ -20,10 +28,14 @@ try:
 except ImportError:
     from python_ import angle_between
     logging.info("Not using Cython")
-from miscellaneous import stats, rotated, further_than, scale, \
-    NextRoundCountdown
+from miscellaneous import stats, further_than, \
+    NextRoundCountdown, SpriteAtlas
 from tile import Tile
 from drop import Drop
+from profiler import Profiler
+from renderqueue import RenderQueue
+from assets import Assets
+from soundbank import SoundBank
 
 
 def _get_vel_list():
@@ -56,16 +68,23 @@ class Zombie(BaseClass):
     x: x coordinate of zombie
     y: y coordinate of zombie"""
     instances = set()  # set of all zombies
-    with open(Options.mappath) as file:
-        map_string = file.read().replace("\n", "")
-        spawn_tiles = [i for i, x in enumerate(map_string) if x == "Z"]
-    imgs = tuple(scale(pygame.image.load("assets/Images/Zombies/zombie{}.png".format(i)))
+    grid = SpatialHash()  # The zombies by the tiles they are on, used by Bullet
+    spawn_tiles = list(Options.compiled_map.zombie_spawns)
+    imgs = tuple(Assets.image("assets/Images/Zombies/zombie{}.png".format(i), Tile.size)
                  for i in range(1, 5))
+    SpriteAtlas.add("zombie", imgs)
     speed_tuple = _get_vel_list()
     logging.info("zombie speeds: %s", speed_tuple)
+    angle_to_vel_tuple = tuple({0: (speed, 0),
+                                math.pi / 2: (0, -speed),
+                                math.pi: (-speed, 0),
+                                math.pi * 3 / 2: (0, speed)} for speed in speed_tuple)
+    random_color = RandomColor(rng.getrandbits(32))
     health_func_tuple = (lambda h: h, lambda h: h / 2,
                          lambda h: h * 1.2, lambda h: h * 4)
-    new_round_song = pygame.mixer.Sound("assets/Audio/Other/new_round_short.ogg")
+    # The file names are numbered in hexadecimal
+    SoundBank.add("spawn", ["assets/Audio/Spawn/zmb_spawn{:x}.wav".format(i) for i in range(20)], channels=2)
+    new_round_song = Assets.sound("assets/Audio/Other/new_round_short.ogg")
     new_round_song.set_volume(Options.volume)
     new_round_song_length = new_round_song.get_length()
     base_health = 100
@@ -79,24 +98,22 @@ class Zombie(BaseClass):
 
     def __init__(self, x, y):
         self.direction = math.pi
-        type_ = randint(0, 3)
+        type_ = rng.randint(0, 3)
         self.type = type_
-        self.org_img = Zombie.imgs[type_]
-        self.img = self.org_img
+        self.img = Zombie.imgs[type_]
         self.speed = Zombie.speed_tuple[type_]
         self.health_func = Zombie.health_func_tuple[type_]
         self.health = self.health_func(Zombie.base_health)
         self.org_health = self.health
-        self.angle_to_vel = {0: (self.speed, 0),
-                             math.pi / 2: (0, -self.speed),
-                             math.pi: (-self.speed, 0),
-                             math.pi * 3 / 2: (0, self.speed)}
+        self.angle_to_vel = Zombie.angle_to_vel_tuple[type_]
         self.vel = Vector(0, 0)
         super().__init__(x, y)
         Zombie.instances.add(self)
+        Zombie.grid.insert(self)
         self.path = []
+        self.path_end, self.repairs = None, 0  # See AStar
         self.last_angle = 0.
-        self.path_color = Color(RandomColor().generate(luminosity="light")[0])
+        self.path_color = Color(Zombie.random_color.generate(luminosity="light")[0])
         logging.info("speed: %s type. %s", self.speed, self.type)
 
     def set_target(self, next_tile: "Tile"):
@@ -106,22 +123,39 @@ class Zombie(BaseClass):
                                             angle, self.to, self.pos, angle % math.pi / 2)
         self.vel = Vector(*self.angle_to_vel[angle])
 
+    def draw(self, screen):
+        x, y = self.draw_pos()
+        RenderQueue.blit(screen, self.img, (x, y))
+        self.health_bar(surface=screen, pos=(x, y))  # Health bar with rounded edges
+        if Options.debug:
+            for tile in self.path:
+                RenderQueue.mark(pygame.draw.circle(screen, self.path_color, tile.get_centre(),
+                                                    Tile.length // 3))
+
+    def find_path(self, survivor, use_flowfield: bool):
+        """Set the target of self to the next tile towards survivor"""
+        if not (use_flowfield and FlowField.step(self)):
+            AStar(self, survivor).solve()
+
     @classmethod
-    def update(cls, screen, survivor):
+    def update(cls, survivor):
+        Planner.collect()
+        if cls.store is not None:
+            cls.update_store(survivor)
+            Planner.flush()
+            return
         del_zmbs = set()
+        use_flowfield = Options.pathfinding == "flowfield"
+        if use_flowfield and cls.instances:
+            FlowField.update(survivor)
         for zmb in cls.instances:
             if zmb.health <= 0.:
                 Drop.spawn(zmb.pos)
                 del_zmbs.add(zmb)
+                cls.grid.remove(zmb)
                 stats["Zombies Killed"] += 1
                 continue
 
-            screen.blit(zmb.img, zmb.pos.as_ints())
-            zmb.health_bar(surface=screen)  # Health bar with rounded edges
-            if Options.debug:
-                for tile in zmb.path:
-                    pygame.draw.circle(screen, zmb.path_color, tile.get_centre(), Tile.length // 3)
-
             zmb_to_survivor_dist = (survivor.pos - zmb.pos).magnitude()
 
             if zmb_to_survivor_dist <= cls.attack_range:
@@ -133,16 +167,49 @@ class Zombie(BaseClass):
                     zmb.to = None  # Trigger A-Star, not run between tiles for performance
                 else:
                     if "freeze" not in Drop.actives:
-                        zmb.pos += zmb.vel
+                        zmb.pos.add_ip(zmb.vel.x, zmb.vel.y)
+                        cls.grid.move(zmb)
                 if zmb.direction != angle:  # New direction, frame after a turn
                     zmb.rotate(angle)
 
             if zmb.to is None and zmb_to_survivor_dist > Tile.length:
-                AStar(zmb, survivor).solve()
+                zmb.find_path(survivor, use_flowfield)
         cls.instances -= del_zmbs
+        Planner.flush()
+
+    @classmethod
+    def update_store(cls, survivor):
+        """Zombie.update for zombies in cls.store, see ZombieStore"""
+        store = cls.store
+        for slot in store.dead():
+            zmb = store.views[slot]
+            Drop.spawn(zmb.pos)
+            cls.instances.remove(zmb)
+            cls.grid.remove(zmb)
+            store.remove(slot)
+            stats["Zombies Killed"] += 1
+
+        dist, crossed = store.step(*survivor.pos, "freeze" in Drop.actives, Tile.length)
+        survivor.health -= 0.4 * np.count_nonzero(dist <= cls.attack_range)
+        for slot in np.flatnonzero(crossed):
+            cls.grid.move(store.views[slot])
+
+        use_flowfield = Options.pathfinding == "flowfield"
+        if use_flowfield and store.n:
+            FlowField.update(survivor)
+        for slot in np.flatnonzero(~store.has_target[:store.n] & (dist > Tile.length)):
+            store.views[slot].find_path(survivor, use_flowfield)
 
     @classmethod
-    def spawn(cls, screen, totalframes: int, survivor):
+    def draw_all(cls, screen):
+        """Draw every zombie, and the countdown between rounds"""
+        for zmb in cls.instances:
+            zmb.draw(screen)
+        if cls.cool_down:
+            cls.cooldown_counter.draw(screen)
+
+    @classmethod
+    def spawn(cls, totalframes: int, survivor):
         """Spawning and rounds"""
         if Options.no_zombies:
             return
@@ -151,22 +218,17 @@ class Zombie(BaseClass):
             if totalframes % cls.spawn_interval == 0:
                 cls.left_round -= 1
                 if cls.play_song:
-                    # filenanes are numbered in hexadecimal
-                    file_nr = format(randint(0, 19), "x")
-                    sound = pygame.mixer.Sound(
-                        "assets/Audio/Spawn/zmb_spawn{}.wav".format(file_nr)
-                    )
-                    sound.set_volume(Options.volume)
-                    sound.play()
+                    SoundBank.play("spawn", rng.randint(0, 19))
                 cls.play_song = not cls.play_song  # Loop True and False, only play every other spawn
                 partialled_further_than = partial(
                     further_than, survivor=survivor, min_dist=150)
                 valid_tiles = list(filter(partialled_further_than, cls.spawn_tiles))
                 if not valid_tiles:
                     valid_tiles.extend(cls.spawn_tiles)
-                spawn_idx = choice(valid_tiles)
+                spawn_idx = rng.choice(valid_tiles)
                 spawn_node = Tile.instances[spawn_idx]
-                cls(*spawn_node.pos)
+                zombie_class = StoredZombie if cls.store is not None else cls
+                zombie_class(*spawn_node.pos)
                 logging.info("spawn_idx: %s, spawn_node: %s, valid: %s, survivor: %s",
                               spawn_idx, spawn_node.pos, valid_tiles, survivor.pos)
         elif not (cls.instances or cls.cool_down):  # Round is over, start cooldown
@@ -196,34 +258,111 @@ class Zombie(BaseClass):
 
         else:
             if cls.cool_down:
-                cls.cooldown_counter.update(screen)
+                cls.cooldown_counter.update()
 
     def rotate(self, new_dir: float):
         """Rotate self.img, set self.direction to new_dir
         :param new_dir: The angle to rotate self clockwise from the x-axis in radians"""
-        self.img = rotated(self.org_img, new_dir)
+        self.img = SpriteAtlas.sprites[("zombie", self.type), new_dir]
         self.direction = new_dir
 
-    def health_bar(self, surface):
-        """Draw a health bar with rounded egdes above the zombie"""
-        color = DARK_RED
+    def health_bar(self, surface, pos=None):
+        """Draw a health bar with rounded egdes above the zombie
+        :param pos: Where the zombie is drawn, self.pos if None"""
+        if pos is None:
+            pos = self.pos
         rect = pygame.Rect(
-            *(self.pos - (0, 12)),
+            pos[0], pos[1] - 12,
             self.width * self.health / self.org_health,
             self.height / 6
         )
-        zeroed_rect = rect.copy()
-        zeroed_rect.topleft = 0, 0
-        image = pygame.Surface(rect.size).convert_alpha()
+        RenderQueue.blit(surface, Zombie.health_bar_image(*rect.size, Tile.length), rect)
+
+    @staticmethod
+    @lru_cache(maxsize=100)  # Tile.length is less than 100, so every width fits
+    def health_bar_image(width: int, height: int, tile_length: int):
+        """Return a health bar with rounded egdes of size width, height
+        The bars are cached as there is at most one for every width in pixels.
+        tile_length is only part of the key, so bars drawn before Tile.length
+        changed aren't used after"""
+        color = DARK_RED
+        zeroed_rect = pygame.Rect(0, 0, width, height)
+        image = pygame.Surface(zeroed_rect.size).convert_alpha()
+        Profiler.count("surfaces", 2)  # The Surface and its converted copy
         image.fill(TRANSPARENT)
 
         corners = zeroed_rect.inflate(-6, -6)
         for attribute in ("topleft", "topright", "bottomleft", "bottomright"):
-            pygame.draw.circle(image, color, getattr(corners, attribute), rect.height // 2)
+            pygame.draw.circle(image, color, getattr(corners, attribute), height // 2)
         image.fill(color, zeroed_rect.inflate(-6, 0))
         image.fill(color, zeroed_rect.inflate(0, -6))
+        return image
+
+
+class StoredZombie(Zombie):
+    """A Zombie whose position, velocity, target, health and type are kept in Zombie.store
+    Used with the --numpy flag. Reading pos, vel or to returns a new Vector,
+    so they must be assigned to, not changed in place, e.g. zmb.pos += v works"""
+
+    def __init__(self, x, y):
+        self.slot = Zombie.store.add(self)
+        super().__init__(x, y)
+        Zombie.store.type[self.slot] = self.type
+
+    def get_pos(self):
+        store = Zombie.store
+        return Vector(float(store.x[self.slot]), float(store.y[self.slot]))
+
+    def set_pos(self, new):
+        Zombie.store.x[self.slot], Zombie.store.y[self.slot] = new
+
+    pos = property(get_pos, set_pos)
+
+    def get_vel(self):
+        store = Zombie.store
+        return Vector(float(store.vx[self.slot]), float(store.vy[self.slot]))
+
+    def set_vel(self, new):
+        Zombie.store.vx[self.slot], Zombie.store.vy[self.slot] = new
+
+    vel = property(get_vel, set_vel)
+
+    def get_to(self):
+        store = Zombie.store
+        if not store.has_target[self.slot]:
+            return None
+        return Vector(float(store.tx[self.slot]), float(store.ty[self.slot]))
+
+    def set_to(self, new):
+        store = Zombie.store
+        store.has_target[self.slot] = new is not None
+        if new is not None:
+            store.tx[self.slot], store.ty[self.slot] = new
+
+    to = property(get_to, set_to)
+
+    def get_health(self):
+        return float(Zombie.store.health[self.slot])
+
+    def set_health(self, new):
+        Zombie.store.health[self.slot] = new
+
+    health = property(get_health, set_health)
+
+    def set_target(self, next_tile: "Tile"):
+        """Zombie.set_target, but the zombie turns at once as ZombieStore.step doesn't turn it"""
+        super().set_target(next_tile)
+        angle = angle_between(*self.pos, *next_tile.pos)
+        if self.direction != angle:
+            self.rotate(angle)
+
 
-        surface.blit(image, rect)
+Zombie.store = None  # A ZombieStore with the state of all zombies if --numpy is set
+if Options.numpy:
+    if ZombieStore is None:
+        logging.warning("--numpy was set, but NumPy isn't installed")
+    else:
+        Zombie.store = ZombieStore()
 
 
 if __name__ == "__main__":
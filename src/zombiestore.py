@@ -0,0 +1,81 @@
+"""A structure of arrays with the state of every zombie, used with the --numpy flag"""
+
+import numpy as np
+
+
+class ZombieStore:
+    """The position, velocity, target, health and type of every zombie in NumPy arrays.
+    The zombies are in slot 0 to n - 1 of every array. When a zombie is removed the
+    last zombie is moved into its slot, so the slots in use are always contiguous.
+    views[slot] is the zombie object using the slot; zombie.slot is its index.
+    This way moving the zombies, measuring their distance to the survivor and finding
+    the dead ones is a few array operations per frame instead of a loop over all zombies
+    Params:
+    capacity: The initial length of the arrays, they double in length when full"""
+    fields = {"x": float, "y": float, "vx": float, "vy": float,
+              "tx": float, "ty": float, "has_target": bool,
+              "health": float, "type": np.int8}
+
+    def __init__(self, capacity=64):
+        self.n = 0
+        self.views = []
+        for name, dtype in ZombieStore.fields.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+
+    def __len__(self):
+        return self.n
+
+    def add(self, view) -> int:
+        """Reserve a slot for view and return its index"""
+        if self.n == len(self.x):
+            for name in ZombieStore.fields:
+                old = getattr(self, name)
+                new = np.zeros(len(old) * 2, old.dtype)
+                new[:self.n] = old[:self.n]
+                setattr(self, name, new)
+        slot = self.n
+        for name in ZombieStore.fields:
+            getattr(self, name)[slot] = 0
+        self.views.append(view)
+        self.n += 1
+        return slot
+
+    def remove(self, slot: int):
+        """Free slot and move the last zombie into it"""
+        last = self.n - 1
+        if slot != last:
+            for name in ZombieStore.fields:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.views[last]
+            moved.slot = slot
+            self.views[slot] = moved
+        self.views.pop()
+        self.n -= 1
+
+    def dead(self):
+        """Return the slots of the zombies with no health left, highest first
+        so they can be removed in that order"""
+        return np.flatnonzero(self.health[:self.n] <= 0)[::-1]
+
+    def step(self, survivor_x: float, survivor_y: float, frozen: bool, length: int):
+        """Move every zombie one frame towards its target. A zombie that is on its
+        target has its target removed, see Zombie.update
+        :param length: The length of a tile
+        :return: The distances from the zombies to the survivor before moving, and
+        a mask of the zombies that moved onto another tile"""
+        n = self.n
+        x, y = self.x[:n], self.y[:n]
+        dist = np.hypot(survivor_x - x, survivor_y - y)
+        has_target = self.has_target[:n]
+        has_target &= (x != self.tx[:n]) | (y != self.ty[:n])
+        if frozen:
+            return dist, np.zeros(n, bool)
+        old_cells = np.floor(x / length), np.ceil(x / length), np.floor(y / length), np.ceil(y / length)
+        x += np.where(has_target, self.vx[:n], 0)
+        y += np.where(has_target, self.vy[:n], 0)
+        new_cells = np.floor(x / length), np.ceil(x / length), np.floor(y / length), np.ceil(y / length)
+        crossed = np.zeros(n, bool)
+        for old, new in zip(old_cells, new_cells):
+            crossed |= old != new
+        return dist, crossed
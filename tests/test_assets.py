@@ -0,0 +1,32 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+import pygame
+from assets import Assets
+
+
+class AssetsTest(unittest.TestCase):
+    def test_image(self):
+        path = "assets/Images/Drops/freeze.png"
+        original = Assets.image(path)
+        scaled = Assets.image(path, (12, 7))
+        self.assertEqual(scaled.get_size(), (12, 7))
+        self.assertIs(Assets.image(path), original)
+        self.assertIs(Assets.image(path, (12.5, 7.9)), scaled)
+        self.assertEqual(Assets.image(path, (5, 5)).get_size(), (5, 5))
+
+    def test_sound(self):
+        path = "assets/Audio/Drop/freeze.ogg"
+        self.assertIsInstance(Assets.sound(path), pygame.mixer.Sound)
+        self.assertIs(Assets.sound(path), Assets.sound(path))
+
+    def test_preload(self):
+        Assets.preload()
+        Assets.preloader.join()
+        self.assertIn("assets/Audio/Spawn/zmb_spawnf.wav", Assets.sounds)
+        self.assertIn(("assets/Images/Zombies/zombie1.png", None), Assets.images)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+from astar import AStar, SearchSpace
+from baseclass import BaseClass
+from flowfield import FlowField
+from options import Options
+from tile import Tile
+
+
+class Walker(BaseClass):
+    """The parts of Zombie used by AStar"""
+    def __init__(self, x, y):
+        super().__init__(x, y)
+        self.path, self.path_end, self.repairs = [], None, 0
+
+    def set_target(self, next_tile):
+        self.to = next_tile.pos
+
+
+class AStarTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+        AStarTest.path_table, Options.path_table = Options.path_table, "off"  # Test the search, see test_pathtable
+        AStar.load_table()
+
+    def tearDownClass():
+        Tile.delete()
+        Options.path_table = AStarTest.path_table
+        AStar.load_table()
+
+    def test_shortest_paths(self):
+        opens = sorted(Tile.opens)
+        start, end = opens[0], opens[-1]
+        astar = AStar(BaseClass(*start.pos), BaseClass(*end.pos))
+        path = AStar.space.search(start.number, end.number,
+                                  Tile.neighbours, astar.get_heuristic)
+        self.assertEqual(path[0], end.number)
+        for a, b in zip(path, path[1:] + [start.number]):
+            self.assertIn(b, Tile.neighbours(a))
+
+        FlowField.update(BaseClass(*end.pos))
+        num, steps = start.number, 0
+        while num != end.number:
+            num = FlowField.next_num[num]
+            steps += 1
+        self.assertEqual(len(path), steps)
+
+    def test_generations(self):
+        space = SearchSpace(Tile.amnt_tiles)
+        start = min(Tile.opens)
+        astar = AStar(BaseClass(*start.pos), BaseClass(*start.pos))
+        self.assertEqual(space.search(start.number, start.number,
+                                      Tile.neighbours, astar.get_heuristic), [])
+        for tile in sorted(Tile.opens)[1:5]:
+            astar = AStar(BaseClass(*start.pos), BaseClass(*tile.pos))
+            first = space.search(start.number, tile.number,
+                                 Tile.neighbours, astar.get_heuristic)
+            second = space.search(start.number, tile.number,
+                                  Tile.neighbours, astar.get_heuristic)
+            self.assertEqual(first, second)
+        self.assertEqual(space.generation, 9)
+
+
+    def assert_valid_path(self, walker, end):
+        self.assertIs(walker.path[0], end)
+        for a, b in zip(walker.path, walker.path[1:] + [walker.get_tile()]):
+            self.assertIn(b.number, Tile.neighbours(a.number))
+
+    def test_path_reuse(self):
+        opens = sorted(Tile.opens)
+        walker, end = Walker(*opens[0].pos), opens[-1]
+        survivor = BaseClass(*end.pos)
+        AStar(walker, survivor).solve()
+        path, generation = walker.path, AStar.space.generation
+        AStar(walker, survivor).solve()
+        self.assertIs(walker.path, path)
+        self.assertEqual(AStar.space.generation, generation)
+
+        new_end = next(t for t in map(Tile.instances.__getitem__, Tile.neighbours(end.number))
+                       if t not in walker.path)
+        AStar(walker, BaseClass(*new_end.pos)).solve()
+        self.assertEqual(AStar.space.generation, generation)
+        self.assertEqual(walker.repairs, 1)
+        self.assert_valid_path(walker, new_end)
+
+        AStar(walker, survivor).solve()  # Back along the path
+        self.assertEqual(walker.repairs, 2)
+        self.assert_valid_path(walker, end)
+
+        walker.repairs = AStar.max_repairs
+        AStar(walker, BaseClass(*new_end.pos)).solve()
+        self.assertEqual(AStar.space.generation, generation + 1)
+        self.assertEqual(walker.repairs, 0)
+        self.assert_valid_path(walker, new_end)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,6 +32,20 @@ class BaseClassTest(unittest.TestCase):
         self.assertEqual(b.get_number(), 0)
         self.assertIs(b.get_tile(), Tile.instances[0])
 
+    def test_interpolation(self):
+        a = BaseClass(x=10, y=10)
+        b = BaseClass(x=0, y=0)
+        self.assertEqual(a.draw_pos(), (10, 10))
+        BaseClass.remember_positions([a, b])
+        a.pos += (-8, 4)
+        try:
+            BaseClass.interpolation = 0.25
+            self.assertEqual(a.draw_pos(), (8, 11))
+            self.assertEqual(b.draw_pos(), (0, 0))
+        finally:
+            BaseClass.interpolation = 1.
+        self.assertEqual(a.draw_pos(), (2, 14))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
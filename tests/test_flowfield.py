@@ -0,0 +1,38 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+from baseclass import BaseClass
+from flowfield import FlowField
+from tile import Tile
+
+
+class FlowFieldTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+
+    def tearDownClass():
+        Tile.delete()
+
+    def test_every_open_tile_leads_to_target(self):
+        target = min(Tile.opens)
+        FlowField.update(BaseClass(*target.pos))
+        self.assertIs(FlowField.target, target)
+        self.assertEqual(FlowField.next_num[target.number], target.number)
+        for tile in Tile.opens:
+            num, steps = tile.number, 0
+            while num != target.number and steps <= Tile.amnt_tiles:
+                num = FlowField.next_num[num]
+                self.assertNotEqual(num, -1)
+                self.assertTrue(Tile.instances[num].walkable)
+                steps += 1
+            self.assertEqual(num, target.number)
+
+    def test_solids_are_unreachable(self):
+        FlowField.update(BaseClass(*min(Tile.opens).pos))
+        for tile in Tile.solids:
+            self.assertEqual(FlowField.next_num[tile.number], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
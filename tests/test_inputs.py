@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+sys.path.insert(0, os.getcwd() + "/src")
+import pygame
+from inputs import ScriptedInput, Recorder, ReplayInput
+import options
+from options import Options
+from rng import rng
+from survivor import Survivor
+
+
+class ScriptedInputTest(unittest.TestCase):
+    def test_script_is_repeated(self):
+        source = ScriptedInput("2 w\n# a comment\n\n1 a left")
+        survivor = Survivor(0, 0)
+        pressed = [source.poll(None, survivor) for _ in range(6)]
+        self.assertEqual([keys[pygame.K_w] for keys in pressed],
+                         [True, True, False, True, True, False])
+        self.assertTrue(pressed[2][pygame.K_LEFT])
+
+    def test_gun_switches_once_per_press(self):
+        source = ScriptedInput("3 e\n1\n1 e")
+        survivor = Survivor(0, 0)
+        guns = []
+        for _ in range(5):
+            source.poll(None, survivor)
+            guns.append(survivor.current_gun)
+        self.assertEqual(guns[0], guns[1])
+        self.assertEqual(guns[1], guns[2])
+        self.assertEqual(guns[3], guns[2])
+        self.assertNotEqual(guns[4], guns[3])
+
+    def test_unknown_key(self):
+        with self.assertRaises(KeyError):
+            ScriptedInput("1 space")
+
+
+def record(frames: int) -> str:
+    """Record frames frames of a script and return the path of the replay"""
+    path = os.path.join(tempfile.mkdtemp(), "replay.bin")
+    recorder = Recorder(ScriptedInput("2 w left\n1 e\n1\n3 e d"), path)
+    survivor = Survivor(0, 0)
+    for _ in range(frames):
+        recorder.poll(None, survivor)
+    recorder.close()
+    return path
+
+
+def options_of(*args):
+    """Return the Options of a game started with args, without changing rng"""
+    state = rng.getstate()
+    try:
+        with mock.patch("options._args", options.parser.parse_args(args)):
+            return options._Options()
+    finally:
+        rng.setstate(state)
+
+
+class ReplayTest(unittest.TestCase):
+    def test_replay_is_recording(self):
+        path = os.path.join(tempfile.mkdtemp(), "replay.bin")
+        recorder = Recorder(ScriptedInput("2 w left\n1 e\n1\n3 e d"), path)
+        survivor = Survivor(0, 0)
+        recorded = []
+        for _ in range(10):
+            recorded.append((recorder.poll(None, survivor).pressed, survivor.current_gun))
+        recorder.close()
+
+        replay = ReplayInput.from_file(path)
+        self.assertEqual(replay.seed, Options.seed)
+        self.assertEqual(len(replay.masks), 10)
+        survivor = Survivor(0, 0)
+        replayed = []
+        for _ in range(10):
+            replayed.append((replay.poll(None, survivor).pressed, survivor.current_gun))
+        self.assertEqual(replayed, recorded)
+        with self.assertRaises(IndexError):
+            replay.poll(None, survivor)
+
+    def test_options_of_a_replay(self):
+        path = record(10)
+        replay_options = options_of("-H", "--replay", path, "--seed", str(Options.seed + 1))
+        self.assertEqual(replay_options.seed, Options.seed)
+        self.assertEqual(replay_options.frames, 10)
+        self.assertEqual(options_of("-H", "--replay", path, "--frames", "4").frames, 4)
+
+    def test_more_frames_than_recorded(self):
+        path = record(10)
+        replay_options = options_of("-H", "--replay", path, "--frames", "900")
+        self.assertEqual(replay_options.frames, 10)
+        replay = ReplayInput.from_file(path)
+        survivor = Survivor(0, 0)
+        for _ in range(replay_options.frames):
+            replay.poll(None, survivor)
+
+    def test_not_a_replay(self):
+        with self.assertRaises(ValueError):
+            ReplayInput(bytes(64))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.getcwd() + "/src")
+import mapcache
+from mapcache import CompiledMap
+from options import Options
+
+
+class CompiledMapTest(unittest.TestCase):
+    def test_cache(self):
+        old_cache_dir = mapcache.CACHE_DIR
+        mapcache.CACHE_DIR = tempfile.mkdtemp()
+        try:
+            parsed = CompiledMap.load(Options.mappath)
+            self.assertEqual(len(os.listdir(mapcache.CACHE_DIR)), 1)
+            self.assertEqual(CompiledMap.load(Options.mappath), parsed)
+            with open(Options.mappath) as file:
+                self.assertEqual(CompiledMap.compile(file.read()), parsed)
+        finally:
+            mapcache.CACHE_DIR = old_cache_dir
+
+    def test_list_maps(self):
+        folder = tempfile.mkdtemp()
+        for name in ("b.txt", "a.txt", "notes.md"):
+            open(os.path.join(folder, name), "w").close()
+        os.mkdir(os.path.join(folder, "compiled"))
+        self.assertEqual(mapcache.list_maps(folder), ["a.txt", "b.txt"])
+        self.assertIn(Options.mapname, mapcache.list_maps())
+
+    def test_outdated(self):
+        compiled = CompiledMap.compile("#.\n.Z")
+        data = compiled.to_bytes(bytes(20))
+        with self.assertRaises(ValueError):
+            CompiledMap.from_bytes(data, bytes(19) + b"1")
+        self.assertEqual(compiled.adjacency_start, [0, 2, 3, 4, 6])
+        self.assertEqual(compiled.adjacency, [2, 1, 3, 3, 1, 2])
+        self.assertEqual(compiled.walls[4:], [(0, 1, 1, 1), (1, 0, 1, 1)])
+
+    def test_truncated(self):
+        old_cache_dir = mapcache.CACHE_DIR
+        mapcache.CACHE_DIR = tempfile.mkdtemp()
+        try:
+            parsed = CompiledMap.load(Options.mappath)
+            cache_path = os.path.join(mapcache.CACHE_DIR, os.listdir(mapcache.CACHE_DIR)[0])
+            with open(cache_path, "rb") as file:
+                data = file.read()
+            for cut in (2, 4, 400):
+                with self.assertRaises(ValueError):
+                    CompiledMap.from_bytes(data[:-cut], parsed.digest)
+                with open(cache_path, "wb") as file:
+                    file.write(data[:-cut])
+                self.assertEqual(CompiledMap.load(Options.mappath), parsed)  # Parsed and written again
+                self.assertEqual(os.listdir(mapcache.CACHE_DIR), [os.path.basename(cache_path)])
+        finally:
+            mapcache.CACHE_DIR = old_cache_dir
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import math
 from random import random
-from collections import Iterable
+from collections.abc import Iterable
 import sys
 import os
 sys.path.insert(0, os.getcwd() + "/src")
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.getcwd() + "/src")
+import mapcache
+from astar import AStar
+from baseclass import BaseClass
+from flowfield import FlowField
+from options import Options
+from pathtable import PathTable, UNREACHABLE
+from tile import Tile
+
+
+class PathTableTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+
+    def tearDownClass():
+        Tile.delete()
+
+    def test_next_hops_follow_the_flow_field(self):
+        table = PathTable(Options.compiled_map, "next_hop")
+        for target in sorted(Tile.opens)[::7]:
+            FlowField.update(BaseClass(*target.pos))
+            for tile in Tile.opens:
+                path = table.path(tile.number, target.number)
+                if tile is target:
+                    self.assertEqual(path, [])
+                else:
+                    self.assertEqual(path[0], target.number)
+                    self.assertEqual(path[-1], FlowField.next_num[tile.number])
+        self.assertIsNone(table.path(min(Tile.solids).number, target.number))
+
+    def test_landmark_bounds(self):
+        table = PathTable(Options.compiled_map, "landmarks")
+        self.assertEqual(table.landmarks, PathTable.landmark_count)
+        for target in sorted(Tile.opens)[::11]:
+            FlowField.update(BaseClass(*target.pos))
+            for tile in Tile.opens:
+                bound = table.bound(tile.number, target.number)
+                num, steps = tile.number, 0
+                while num != target.number:
+                    num = FlowField.next_num[num]
+                    steps += 1
+                self.assertLessEqual(bound(tile.number), steps)
+                self.assertEqual(bound(target.number), 0)
+
+    def test_astar_with_tables(self):
+        opens = sorted(Tile.opens)
+        start, end = opens[0], opens[-1]
+        lengths = []
+        old_path_table = Options.path_table
+        try:
+            for kind in ("off", "next_hop", "landmarks"):
+                Options.path_table = kind
+                AStar.load_table()
+                self.assertEqual(AStar.table is None, kind == "off")
+                zombie = BaseClass(*start.pos)
+                zombie.path, zombie.path_end, zombie.repairs = [], None, 0
+                zombie.set_target = lambda tile: None
+                AStar(zombie, BaseClass(*end.pos)).solve()
+                self.assertIs(zombie.path[0], end)
+                lengths.append(len(zombie.path))
+        finally:
+            Options.path_table = old_path_table
+            AStar.load_table()
+        self.assertEqual(len(set(lengths)), 1)
+
+    def test_cache(self):
+        old_cache_dir = mapcache.CACHE_DIR
+        mapcache.CACHE_DIR = tempfile.mkdtemp()
+        try:
+            built = PathTable.load(Options.compiled_map, "landmarks")
+            self.assertEqual(len(os.listdir(mapcache.CACHE_DIR)), 1)
+            self.assertEqual(PathTable.load(Options.compiled_map, "landmarks").table, built.table)
+            PathTable.landmark_count -= 1
+            try:
+                self.assertEqual(PathTable.load(Options.compiled_map, "landmarks").landmarks,
+                                 PathTable.landmark_count)
+            finally:
+                PathTable.landmark_count += 1
+        finally:
+            mapcache.CACHE_DIR = old_cache_dir
+
+    def test_unreachable(self):
+        table = PathTable(mapcache.CompiledMap.compile("..#.\n..#."), "next_hop")
+        self.assertEqual(table.path(0, 3), [])
+        self.assertEqual(table.table[table.index[3] * 6 + table.index[0]], UNREACHABLE)
+        table = PathTable(mapcache.CompiledMap.compile("..#.\n..#."), "landmarks")
+        self.assertEqual(table.landmarks, 6)
+        self.assertGreater(table.bound(0, 3)(0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+from astar import AStar
+from baseclass import BaseClass
+from planner import Planner
+from tile import Tile
+
+
+class Walker(BaseClass):
+    """The parts of Zombie used by AStar and Planner"""
+    def __init__(self, x, y):
+        super().__init__(x, y)
+        self.path, self.path_end, self.repairs, self.to = [], None, 0, None
+
+    def set_target(self, next_tile):
+        self.to = next_tile.pos
+
+
+class PlannerTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+        AStar.load_table()  # The same table as Planner.start
+
+    def tearDownClass():
+        Planner.stop()
+        Tile.delete()
+
+    def solve(self, start, end):
+        walker = Walker(*start.pos)
+        AStar(walker, BaseClass(*end.pos)).solve()
+        return walker
+
+    def test_same_paths_as_sync(self):
+        opens = sorted(Tile.opens)
+        pairs = list(zip(opens[::5], opens[::-7]))
+        expected = [self.solve(start, end).path for start, end in pairs]
+        for kind in ("thread", "process"):
+            Planner.start(kind)
+            walkers = [self.solve(start, end) for start, end in pairs]
+            for walker in walkers:
+                self.assertEqual(walker.path, [])
+                self.assertIsNone(walker.to)
+            Planner.flush()
+            Planner.collect()
+            self.assertEqual([walker.path for walker in walkers], expected)
+            Planner.stop()
+        self.assertIsNone(AStar.planner)
+
+    def test_follows_old_path(self):
+        opens = sorted(Tile.opens)
+        start, end = opens[0], opens[-1]
+        walker = self.solve(start, end)
+        old_path = list(walker.path)
+        Planner.start("thread")
+        walker.path_end = None  # Can't be repaired
+        AStar(walker, BaseClass(*end.pos)).solve()
+        self.assertEqual(walker.path, old_path)
+        self.assertEqual(walker.to, old_path[-1].pos)
+        Planner.flush()
+        walker.pos = old_path[-1].pos  # Arrives at the next tile before the new path
+        walker.to = None
+        Planner.collect()
+        self.assertEqual(walker.path, old_path)
+        self.assertIs(walker.path_end, end)
+        self.assertIs(walker.get_tile(), walker.path[-1])
+        AStar(walker, BaseClass(*end.pos)).solve()
+        self.assertEqual(walker.path, old_path[:-1])
+        Planner.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import json
+import csv
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.getcwd() + "/src")
+from profiler import Profiler
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        Profiler.frames.clear()
+        for i in range(3):
+            with Profiler.stage("zombies"):
+                Profiler.count("astar expansions", i)
+            with Profiler.stage("bullets"):
+                pass
+            Profiler.end_frame()
+
+    def test_frames(self):
+        self.assertEqual(len(Profiler.frames), 3)
+        stages, counters = Profiler.frames[-1]
+        self.assertEqual([name for name, start, duration in stages], ["zombies", "bullets"])
+        self.assertEqual(counters, {"astar expansions": 2})
+        self.assertEqual(Profiler.current, [])
+
+    def test_export_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.csv")
+            Profiler.export(path)
+            with open(path) as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual([row["astar expansions"] for row in rows], ["0", "1", "2"])
+
+    def test_export_chrome_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            Profiler.export(path)
+            with open(path) as file:
+                events = json.load(file)["traceEvents"]
+        self.assertEqual(sum(event["ph"] == "X" for event in events), 6)
+        self.assertEqual(sum(event["ph"] == "C" for event in events), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import math
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+try:
+    import numpy as np
+    from raycast import GridRaycaster
+    no_numpy = False
+except ImportError:
+    no_numpy = True
+
+
+@unittest.skipIf(no_numpy, "NumPy isn't installed")
+class GridRaycasterTest(unittest.TestCase):
+    def setUp(self):
+        self.solid = np.array([[1, 1, 1, 1, 1],
+                               [1, 0, 0, 0, 1],
+                               [1, 0, 1, 0, 1],
+                               [1, 0, 0, 0, 1],
+                               [1, 1, 1, 1, 1]], bool)
+        self.raycaster = GridRaycaster(self.solid, 10)
+
+    def test_rays_stop_at_first_wall(self):
+        angles = np.linspace(0, 2 * math.pi, 97)
+        hits = self.raycaster.cast(15, 15, angles)
+        for angle, (x, y) in zip(angles, hits):
+            dx, dy = math.cos(angle), -math.sin(angle)
+            # Just before the hit is open, just after it is solid
+            self.assertFalse(self.solid[int((y - dy * 1e-6) // 10), int((x - dx * 1e-6) // 10)])
+            self.assertTrue(self.solid[int((y + dy * 1e-6) // 10), int((x + dx * 1e-6) // 10)])
+
+    def test_no_leak_through_corners(self):
+        # From the centre of the top left open tile towards the corner of the centre tile
+        x, y = self.raycaster.cast(15, 15, np.array([-math.pi / 4]))[0]
+        self.assertAlmostEqual(x, 20)
+        self.assertAlmostEqual(y, 20)
+
+    def test_outside_is_solid(self):
+        raycaster = GridRaycaster(np.zeros((2, 3), bool), 10)
+        hits = raycaster.cast(5, 5, np.array([0, math.pi / 2, math.pi, math.pi * 3 / 2]))
+        self.assertEqual(hits.round(6).tolist(), [[30, 5], [5, 0], [0, 5], [5, 20]])
+
+
+if __name__ == "__main__":
+    unittest.main()
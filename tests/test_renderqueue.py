@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+import pygame
+from options import Options
+from renderqueue import RenderQueue
+from tile import Tile
+
+
+class RenderQueueTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+
+    def tearDownClass():
+        Tile.delete()
+
+    def test_frames(self):
+        screen = pygame.display.set_mode(Options.screen_size)
+        image = pygame.Surface((5, 5))
+        image.fill((1, 2, 3))
+        RenderQueue.full = True
+        RenderQueue.clear(screen)
+        RenderQueue.blit(screen, image, (2, 3))
+        RenderQueue.update()
+        self.assertFalse(RenderQueue.full)
+        self.assertEqual(RenderQueue.last, [pygame.Rect(2, 3, 5, 5)])
+        self.assertEqual(screen.get_at((2, 3))[:3], (1, 2, 3))
+
+        RenderQueue.clear(screen)  # The image is gone the next frame
+        self.assertEqual(screen.get_at((2, 3)), Tile.background.get_at((2, 3)))
+        RenderQueue.mark(pygame.Rect(10, 10, 1, 1))
+        RenderQueue.update()
+        self.assertEqual(RenderQueue.last, [pygame.Rect(10, 10, 1, 1)])
+        self.assertEqual(RenderQueue.drawn, [])
+
+    def test_disjoint(self):
+        rects = [pygame.Rect(0, 0, 20, 20), pygame.Rect(10, 10, 20, 20),
+                 pygame.Rect(5, 5, 5, 5), pygame.Rect(50, 0, 10, 40), pygame.Rect(0, 0, 0, 0)]
+        disjoint = RenderQueue.disjoint(rects)
+        for i, rect in enumerate(disjoint):
+            self.assertEqual(rect.collidelist(disjoint[i + 1:]), -1)
+        area = pygame.Surface((70, 50))
+        for rect in rects:
+            area.fill((1, 1, 1), rect)
+        for rect in disjoint:
+            area.fill((0, 0, 0), rect)
+        self.assertEqual(pygame.mask.from_threshold(area, (1, 1, 1), (1, 1, 1, 255)).count(), 0)
+        self.assertEqual(sum(rect.w * rect.h for rect in disjoint), 20 * 20 + 20 * 20 - 10 * 10 + 10 * 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import math
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+from options import Options
+from tile import Tile
+try:
+    import numpy as np
+    from raycast import GridRaycaster
+    from shadow import ShadowCaster
+    no_numpy = False
+except ImportError:
+    no_numpy = True
+
+
+@unittest.skipIf(no_numpy, "NumPy isn't installed")
+class ShadowCasterTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+
+    def tearDownClass():
+        Tile.delete()
+
+    def test_same_as_grid_raycaster(self):
+        solid = np.array(Tile.map_, bool).reshape(Options.tiles_y, Options.tiles_x)
+        grid = GridRaycaster(solid, Tile.length)
+        caster = ShadowCaster(Tile.walls)
+        angles = np.random.RandomState(0).uniform(0, 2 * math.pi, 50)
+        for tile in sorted(Tile.opens)[::7]:
+            centre = tile.get_centre()
+            np.testing.assert_allclose(caster.cast(*centre, angles), grid.cast(*centre, angles),
+                                       atol=1e-6)
+
+    def test_polygon_is_in_field_of_view(self):
+        caster = ShadowCaster(Tile.walls)
+        x, y = min(Tile.opens).get_centre()
+        points = caster.polygon(x, y, 1, 2)
+        angles = np.arctan2(y - points[:, 1], points[:, 0] - x)
+        self.assertTrue(np.all((angles >= 1 - 1e-9) & (angles <= 2 + 1e-9)))
+        self.assertTrue(np.all(np.diff(angles) >= 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+import pygame
+from soundbank import SoundBank
+
+
+class SoundBankTest(unittest.TestCase):
+    def test_channels(self):
+        SoundBank.add("test", ["assets/Audio/Drop/freeze.ogg", "assets/Audio/Drop/max_ammo.ogg"],
+                      channels=2, volume=0.5)
+        reserved = [channel for category in SoundBank.categories.values() for channel in category.channels]
+        self.assertEqual(len(reserved), SoundBank.reserved)
+        self.assertEqual(pygame.mixer.get_num_channels(), SoundBank.reserved + SoundBank.free_channels)
+        first = SoundBank.play("test", 0)
+        second = SoundBank.play("test", 1)
+        self.assertIsNot(first, second)
+        self.assertIs(SoundBank.play("test", 0), first)  # The one which has played the longest
+        self.assertIn(first, SoundBank.categories["test"].channels)
+        SoundBank.set_volume("test", 0.25)
+        self.assertEqual(SoundBank.categories["test"].volume, 0.25)
+
+    def test_add_again(self):
+        SoundBank.add("again", ["assets/Audio/Drop/freeze.ogg"], channels=1)
+        reserved, channels = SoundBank.reserved, SoundBank.categories["again"].channels
+        SoundBank.add("again", ["assets/Audio/Drop/max_ammo.ogg"], channels=1, volume=0.5)
+        self.assertEqual(SoundBank.reserved, reserved)
+        self.assertIs(SoundBank.categories["again"].channels, channels)
+        self.assertEqual(SoundBank.categories["again"].volume, 0.5)
+        with self.assertRaises(ValueError):
+            SoundBank.add("again", ["assets/Audio/Drop/freeze.ogg"], channels=2)
+        self.assertEqual(SoundBank.reserved, reserved)
+
+
+if __name__ == "__main__":
+    unittest.main()
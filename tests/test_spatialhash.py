@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+from baseclass import BaseClass
+from spatialhash import SpatialHash
+from tile import Tile
+try:
+    from cython_ import collide
+except ImportError:
+    from python_ import collide
+
+
+class SpatialHashTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+
+    def tearDownClass():
+        Tile.delete()
+
+    def test_query_finds_all_collisions(self):
+        grid = SpatialHash()
+        length = Tile.length
+        objs = [BaseClass(x * length // 3, y * length // 2)
+                for x in range(9) for y in range(4)]
+        for obj in objs:
+            grid.insert(obj)
+        bullet = BaseClass(length - 3, length // 2, 7, 9)
+        colliding = [o for o in objs if collide(*bullet.pos, *bullet._size, *o.pos, *o._size)]
+        found = grid.query(bullet)
+        self.assertTrue(colliding)
+        for obj in colliding:
+            self.assertIn(obj, found)
+
+    def test_move_and_remove(self):
+        grid = SpatialHash()
+        obj = BaseClass(0, 0)
+        grid.insert(obj)
+        self.assertEqual(grid.keys[obj], (0,))
+        obj.pos.x += 1
+        grid.move(obj)
+        self.assertEqual(grid.keys[obj], (0, 1))
+        obj.pos.x += Tile.length - 1
+        grid.move(obj)
+        self.assertEqual(grid.keys[obj], (1,))
+        self.assertEqual(grid.buckets, {1: [obj]})
+        grid.remove(obj)
+        self.assertEqual(len(grid), 0)
+        self.assertEqual(grid.buckets, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import math
+import sys
+import os
+from unittest import mock
+sys.path.insert(0, os.getcwd() + "/src")
+import pygame
+from miscellaneous import SpriteAtlas, new_dir_func
+from tile import Tile
+import bullet as _  # Adds the bullets and guns to the atlas
+from zombie import Zombie
+
+
+class SpriteAtlasTest(unittest.TestCase):
+    def test_every_direction(self):
+        sprite_ids = {sprite_id for sprite_id, _ in SpriteAtlas.sprites}
+        for name in ("zombie", "gun", "bullet"):
+            self.assertIn((name, 0), sprite_ids)
+        for sprite_id in sprite_ids:
+            for direction in new_dir_func:
+                self.assertIn((sprite_id, direction), SpriteAtlas.sprites)
+        self.assertEqual(len(SpriteAtlas.sprites), len(sprite_ids) * len(new_dir_func))
+
+    def test_rotated_size(self):
+        SpriteAtlas.add("test", [pygame.Surface((3, 1)), pygame.Surface((2, 5))])
+        for i, (width, height) in enumerate(((3, 1), (2, 5))):
+            for direction in (0, math.pi):
+                self.assertEqual(SpriteAtlas.sprites[("test", i), direction].get_size(), (width, height))
+            for direction in (math.pi / 2, math.pi * 1.5):
+                self.assertEqual(SpriteAtlas.sprites[("test", i), direction].get_size(), (height, width))
+        for direction in new_dir_func:
+            for i in range(2):
+                del SpriteAtlas.sprites[("test", i), direction]
+
+    def test_zombie_turns_without_transform(self):
+        Tile.create()
+        zombie = Zombie(*min(Tile.opens).pos)
+        try:
+            with mock.patch("pygame.transform.rotate", side_effect=AssertionError), \
+                    mock.patch("pygame.transform.flip", side_effect=AssertionError):
+                for direction in new_dir_func:
+                    zombie.rotate(direction)
+                    self.assertIs(zombie.img, SpriteAtlas.sprites[("zombie", zombie.type), direction])
+                    self.assertEqual(zombie.direction, direction)
+        finally:
+            Zombie.instances.discard(zombie)
+            Zombie.grid.remove(zombie)
+            Tile.delete()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import math
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+from survivor import Survivor
+from tile import Tile
+
+
+class LightCacheTest(unittest.TestCase):
+    def setUpClass():
+        Tile.create()
+
+    def tearDownClass():
+        Tile.delete()
+
+    def setUp(self):
+        Survivor.light_cache.clear()
+        self.survivor = Survivor(*min(Tile.opens).pos)
+
+    def test_cached_while_standing_still(self):
+        points = self.survivor.cached_light_polygon()
+        self.assertIs(self.survivor.cached_light_polygon(), points)
+        self.assertEqual(points, self.survivor.light_polygon())
+        self.survivor.direction = 0
+        self.assertIsNot(self.survivor.cached_light_polygon(), points)
+        self.assertEqual(len(Survivor.light_cache), 2)
+
+    def test_not_cached_between_tiles(self):
+        self.survivor.pos += (1, 0)
+        self.survivor.cached_light_polygon()
+        self.assertEqual(len(Survivor.light_cache), 0)
+
+    def test_least_recently_used_is_removed(self):
+        old_size, Survivor.light_cache_size = Survivor.light_cache_size, 2
+        first = self.survivor.cached_light_polygon()
+        for direction in (0, math.pi):
+            self.survivor.direction = direction
+            self.survivor.cached_light_polygon()
+        Survivor.light_cache_size = old_size
+        self.assertEqual(len(Survivor.light_cache), 2)
+        self.survivor.direction = math.pi / 2
+        self.assertIsNot(self.survivor.cached_light_polygon(), first)
+
+    def test_precompute(self):
+        Survivor.precompute_light()
+        self.assertEqual(len(Survivor.light_cache), len(Tile.opens) * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
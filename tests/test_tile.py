@@ -1,9 +1,11 @@
 import unittest
 import sys
 import os
+import pygame
 sys.path.insert(0, os.getcwd() + "/src")
 from tile import Tile
 from maths import Vector
+from options import Options
 
 
 class TileTest(unittest.TestCase):
@@ -30,6 +32,54 @@ class TileTest(unittest.TestCase):
         b = Tile.instances[1]
         self.assertTrue(b > a)
 
+    def test_adjacency(self):
+        self.assertEqual(len(Tile.adjacency_start), Tile.amnt_tiles + 1)
+        for tile in Tile.instances:
+            for num in Tile.neighbours(tile.number):
+                other = Tile.instances[num]
+                self.assertTrue(other.walkable)
+                self.assertEqual((tile.pos - other.pos).manhattan_dist(), Tile.length)
+        self.assertFalse(Tile.on_screen(0, -1))
+        self.assertFalse(Tile.on_screen(1, Tile.amnt_tiles))
+
+    def test_background(self):
+        centre = Tile.length // 2
+        for tile in Tile.instances:
+            color = Options.fillcolor if tile.walkable else Options.loopcolor
+            self.assertEqual(Tile.background.get_at((tile.pos + centre).as_ints())[:3], color[:3])
+
+    def test_restore(self):
+        screen = pygame.Surface(Options.screen_size)
+        screen.fill((1, 2, 3))
+        rect = pygame.Rect(Tile.length, Tile.length, Tile.length * 2, 5)
+        Tile.restore(screen, [rect])
+        self.assertEqual(screen.get_at(rect.topleft), Tile.background.get_at(rect.topleft))
+        self.assertEqual(screen.get_at((rect.right - 1, rect.bottom - 1)),
+                         Tile.background.get_at((rect.right - 1, rect.bottom - 1)))
+        self.assertEqual(screen.get_at(rect.bottomleft)[:3], (1, 2, 3))
+        self.assertEqual(screen.get_at((0, 0))[:3], (1, 2, 3))
+
+    def test_walls(self):
+        length = Tile.length
+        for x1, y1, x2, y2 in Tile.walls[4:]:  # The first four are the edges of the map
+            self.assertTrue(x1 < x2 and y1 == y2 or x1 == x2 and y1 < y2)
+            # Every tile length of a wall is between a solid and an open tile
+            for i in range((x2 - x1 + y2 - y1) // length):
+                if y1 == y2:
+                    x, y = x1 + i * length, y1
+                    nums = Tile.get_number((x, y - length)), Tile.get_number((x, y))
+                else:
+                    x, y = x1, y1 + i * length
+                    nums = Tile.get_number((x - length, y)), Tile.get_number((x, y))
+                self.assertNotEqual(nums[0] in Tile.solid_nums, nums[1] in Tile.solid_nums)
+
+    def test_closest_open_tile(self):
+        for tile in Tile.instances:
+            closest = tile.closest_open_tile()
+            self.assertTrue(closest.walkable)
+            dist = (tile.pos - closest.pos).magnitude_squared()
+            self.assertEqual(dist, min((tile.pos - x.pos).magnitude_squared() for x in Tile.opens))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
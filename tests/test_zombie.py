@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+import pygame
+from color import DARK_RED, TRANSPARENT
+from options import Options
+from tile import Tile
+from zombie import Zombie
+
+
+def uncached_health_bar(width, height):
+    """The image Zombie.health_bar drew every frame before the bars were cached"""
+    rect = pygame.Rect(0, 0, width, height)
+    image = pygame.Surface(rect.size).convert_alpha()
+    image.fill(TRANSPARENT)
+    corners = rect.inflate(-6, -6)
+    for attribute in ("topleft", "topright", "bottomleft", "bottomright"):
+        pygame.draw.circle(image, DARK_RED, getattr(corners, attribute), rect.height // 2)
+    image.fill(DARK_RED, rect.inflate(-6, 0))
+    image.fill(DARK_RED, rect.inflate(0, -6))
+    return image
+
+
+class HealthBarTest(unittest.TestCase):
+    def setUpClass():
+        pygame.display.set_mode(Options.screen_size)  # For convert_alpha
+
+    def setUp(self):
+        Zombie.health_bar_image.cache_clear()
+
+    def test_same_size_is_cached(self):
+        height = Tile.length // 6
+        image = Zombie.health_bar_image(Tile.length, height, Tile.length)
+        self.assertIs(Zombie.health_bar_image(Tile.length, height, Tile.length), image)
+        self.assertIsNot(Zombie.health_bar_image(Tile.length - 1, height, Tile.length), image)
+        self.assertEqual(Zombie.health_bar_image.cache_info().hits, 1)
+
+    def test_tile_length_is_part_of_the_key(self):
+        height = Tile.length // 6
+        image = Zombie.health_bar_image(Tile.length, height, Tile.length)
+        old_length = Tile.length
+        Tile.length += 1
+        try:
+            self.assertIsNot(Zombie.health_bar_image(old_length, height, Tile.length), image)
+        finally:
+            Tile.length = old_length
+
+    def test_same_pixels_as_uncached(self):
+        height = Tile.length // 6
+        for width in range(1, Tile.length + 1):
+            image = Zombie.health_bar_image(width, height, Tile.length)
+            reference = uncached_health_bar(width, height)
+            self.assertEqual(image.get_size(), reference.get_size())
+            for x in range(width):
+                for y in range(height):
+                    self.assertEqual(image.get_at((x, y)), reference.get_at((x, y)), (width, x, y))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.getcwd() + "/src")
+
+try:
+    from zombiestore import ZombieStore
+    no_numpy = False
+except ImportError:
+    no_numpy = True
+
+
+class View:
+    slot = None
+
+
+@unittest.skipIf(no_numpy, "NumPy isn't available")
+class ZombieStoreTest(unittest.TestCase):
+    def test_add_and_remove(self):
+        store = ZombieStore(capacity=2)
+        views = [View() for _ in range(5)]
+        for i, view in enumerate(views):
+            view.slot = store.add(view)
+            store.health[view.slot] = i
+        self.assertEqual(len(store), 5)
+        self.assertGreaterEqual(len(store.x), 5)
+        store.remove(views[1].slot)
+        self.assertEqual(views[4].slot, 1)
+        self.assertEqual(store.health[1], 4)
+        self.assertEqual(store.views, [views[0], views[4], views[2], views[3]])
+
+    def test_dead(self):
+        store = ZombieStore()
+        for health in (10, 0, 5, -1):
+            store.health[store.add(View())] = health
+        self.assertEqual(list(store.dead()), [3, 1])
+
+    def test_step(self):
+        store = ZombieStore()
+        moving, arrived = store.add(View()), store.add(View())
+        store.vx[moving], store.tx[moving] = 4, 12
+        store.has_target[moving] = True
+        store.has_target[arrived] = True
+        dist, crossed = store.step(0, 3, False, 12)
+        self.assertEqual(list(dist), [3, 3])
+        self.assertEqual(store.x[moving], 4)
+        self.assertTrue(crossed[moving])
+        self.assertFalse(store.has_target[arrived])
+        for _ in range(2):
+            store.step(0, 0, False, 12)
+        self.assertEqual(store.x[moving], 12)
+        store.step(0, 0, False, 12)
+        self.assertFalse(store.has_target[moving])
+        self.assertEqual(store.x[moving], 12)
+
+
+if __name__ == "__main__":
+    unittest.main()